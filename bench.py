@@ -0,0 +1,206 @@
+"""Benchmark throughput TeaFiAutoClaim terhadap mock_server.py lokal.
+
+Setiap kombinasi mode x jumlah wallet dijalankan di subprocess sendiri
+(dengan mock server baru), lalu dilaporkan wall time, latency request
+p50/p99 dan peak memory (max RSS).
+
+Contoh:
+    python bench.py
+    python bench.py --sizes 1000 --modes parallel async --workers 20 --latency 50
+    python bench.py --error-rate 0.02 --burst-period 10 --slow-proxy 8766:300 --dead-proxy 8767
+"""
+import argparse
+import json
+import os
+import resource
+import socket
+import subprocess
+import sys
+import tempfile
+import time
+
+ROOT = os.path.dirname(os.path.abspath(__file__))
+
+# Env tambahan per mode; mode baru cukup ditambahkan di sini
+MODES = {
+    'sequential': {'CLAIM_MODE': 'sequential'},
+    'parallel': {'CLAIM_MODE': 'parallel'},
+    'async': {'CLAIM_MODE': 'async'},
+    'adaptive': {'CLAIM_MODE': 'parallel', 'ADAPTIVE_CONCURRENCY': 'true'},
+    'speculative': {'CLAIM_MODE': 'async', 'SPECULATIVE_CHECKIN': 'true'},
+    # Latency diukur di worker process, jadi p50/p99 mode ini tidak tersedia (0)
+    'sharded': {'CLAIM_MODE': 'sharded', 'SHARDS': '4', 'SHARD_ENGINE': 'async'},
+}
+
+RESULT_MARKER = 'BENCH_RESULT '
+
+
+def percentile(samples, pct):
+    if not samples:
+        return 0.0
+    ordered = sorted(samples)
+    index = min(len(ordered) - 1, int(round(pct / 100 * (len(ordered) - 1))))
+    return ordered[index]
+
+
+def run_child():
+    """Dijalankan di subprocess: satu run claim, cetak hasil sebagai JSON"""
+    sys.path.insert(0, ROOT)
+    import p
+    
+    claimer = p.TeaFiAutoClaim()
+    
+    # Simpan semua sample latency (selain histogram) untuk p50/p99
+    samples = []
+    observe = claimer.metrics.observe
+    
+    def record(endpoint, proxy, seconds):
+        samples.append(seconds)
+        observe(endpoint, proxy, seconds)
+    
+    claimer.metrics.observe = record
+    
+    started = time.perf_counter()
+    results = claimer.run_claim() or {}
+    wall = time.perf_counter() - started
+    
+    print(RESULT_MARKER + json.dumps({
+        'wall': wall,
+        'p50': percentile(samples, 50),
+        'p99': percentile(samples, 99),
+        'requests': len(samples),
+        # RUSAGE_CHILDREN = RSS worker shard terbesar (hanya terisi di mode sharded)
+        'peak_rss_mb': (resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+                        + resource.getrusage(resource.RUSAGE_CHILDREN).ru_maxrss) / 1024,
+        'success': results.get('success', 0),
+        'skipped': results.get('skipped', 0),
+        'failed': results.get('failed', 0),
+    }), flush=True)
+
+
+def wait_for_port(host, port, timeout=10):
+    deadline = time.monotonic() + timeout
+    while time.monotonic() < deadline:
+        try:
+            with socket.create_connection((host, port), timeout=0.5):
+                return
+        except OSError:
+            time.sleep(0.05)
+    raise RuntimeError(f"Mock server tidak bisa dihubungi di {host}:{port}")
+
+
+def start_mock(args):
+    command = [
+        sys.executable, os.path.join(ROOT, 'mock_server.py'),
+        '--port', str(args.port),
+        '--latency', str(args.latency),
+        '--jitter', str(args.jitter),
+        '--error-rate', str(args.error_rate),
+        '--burst-period', str(args.burst_period),
+        '--burst-duration', str(args.burst_duration),
+        '--capacity', str(args.capacity),
+    ]
+    for spec in args.slow_proxy:
+        command += ['--slow-proxy', spec]
+    for port in args.dead_proxy:
+        command += ['--dead-proxy', str(port)]
+    
+    process = subprocess.Popen(command, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+    wait_for_port('127.0.0.1', args.port)
+    return process
+
+
+def run_case(args, mode, size, wallets_file):
+    proxies = []
+    if args.slow_proxy or args.dead_proxy:
+        proxies = [f"127.0.0.1:{args.port}"]
+        proxies += [f"127.0.0.1:{spec.split(':')[0]}" for spec in args.slow_proxy]
+        proxies += [f"127.0.0.1:{port}" for port in args.dead_proxy]
+    
+    env = dict(os.environ)
+    env.update({
+        'TEAFI_BASE_URL': f"http://127.0.0.1:{args.port}",
+        'WALLETS': '',
+        'WALLETS_FILE': wallets_file,
+        'PROXIES': ','.join(proxies),
+        'PROXIES_FILE': '',
+        'MAX_WORKERS': str(args.workers),
+        'ASYNC_CONCURRENCY': str(args.concurrency),
+        'CLAIM_RATE': '0',
+        'RETRY_COUNT': str(args.retries),
+        'RETRY_BASE_DELAY': '0.2',
+        'RETRY_MAX_DELAY': '5',
+        'CONNECT_TIMEOUT': '2',
+        'REQUEST_TIMEOUT': '5',
+        'LEDGER_PATH': '',
+        'JOURNAL_PATH': '',
+        'HISTORY_PATH': '',
+        'RESULT_SINK': '',
+        'METRICS_FILE': '',
+        'METRICS_PORT': '',
+        'LOG_LEVEL': 'ERROR',
+        'LOG_WALLET_DETAILS': 'false',
+    })
+    env.update(MODES[mode])
+    
+    mock = start_mock(args)
+    try:
+        completed = subprocess.run([sys.executable, os.path.abspath(__file__), '--child'],
+                                   env=env, capture_output=True, text=True)
+    finally:
+        mock.terminate()
+        mock.wait()
+    
+    for line in completed.stdout.splitlines():
+        if line.startswith(RESULT_MARKER):
+            return json.loads(line[len(RESULT_MARKER):])
+    raise RuntimeError(f"Benchmark {mode}/{size} gagal:\n{completed.stdout[-2000:]}{completed.stderr[-2000:]}")
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Benchmark TeaFiAutoClaim terhadap mock server lokal')
+    parser.add_argument('--child', action='store_true', help=argparse.SUPPRESS)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[100, 1000, 10000])
+    parser.add_argument('--modes', nargs='+', default=list(MODES), choices=list(MODES))
+    parser.add_argument('--workers', type=int, default=20, help='MAX_WORKERS untuk mode parallel')
+    parser.add_argument('--concurrency', type=int, default=200, help='ASYNC_CONCURRENCY untuk mode async')
+    parser.add_argument('--retries', type=int, default=2)
+    parser.add_argument('--max-sequential', type=int, default=1000,
+                        help='lewati mode sequential untuk jumlah wallet di atas ini')
+    parser.add_argument('--port', type=int, default=18765)
+    parser.add_argument('--latency', type=float, default=20)
+    parser.add_argument('--jitter', type=float, default=10)
+    parser.add_argument('--error-rate', type=float, default=0.0)
+    parser.add_argument('--burst-period', type=float, default=0)
+    parser.add_argument('--burst-duration', type=float, default=1)
+    parser.add_argument('--capacity', type=int, default=0, help='batas request bersamaan mock (0 = tanpa batas)')
+    parser.add_argument('--slow-proxy', action='append', default=[], metavar='PORT:MS')
+    parser.add_argument('--dead-proxy', action='append', default=[], type=int, metavar='PORT')
+    args = parser.parse_args()
+    
+    if args.child:
+        run_child()
+        return
+    
+    print(f"{'mode':<12}{'wallets':>9}{'wall (s)':>11}{'p50 (ms)':>11}{'p99 (ms)':>11}"
+          f"{'peak MB':>10}{'ok/skip/fail':>16}")
+    with tempfile.TemporaryDirectory() as tmp:
+        for size in args.sizes:
+            wallets_file = os.path.join(tmp, f"wallets_{size}.txt")
+            with open(wallets_file, 'w') as output:
+                for i in range(size):
+                    output.write(f"0x{i:040x}\n")
+            
+            for mode in args.modes:
+                if mode == 'sequential' and size > args.max_sequential:
+                    print(f"{mode:<12}{size:>9}{'skipped (--max-sequential)':>40}")
+                    continue
+                
+                result = run_case(args, mode, size, wallets_file)
+                outcome = f"{result['success']}/{result['skipped']}/{result['failed']}"
+                print(f"{mode:<12}{size:>9}{result['wall']:>11.2f}{result['p50'] * 1000:>11.1f}"
+                      f"{result['p99'] * 1000:>11.1f}{result['peak_rss_mb']:>10.1f}{outcome:>16}", flush=True)
+
+
+if __name__ == "__main__":
+    main()
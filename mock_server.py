@@ -0,0 +1,227 @@
+"""Mock lokal API Tea-Fi untuk benchmark dan testing offline.
+
+Implementasi GET /wallet/check-in/current dan POST /wallet/check-in dengan
+latency, error rate dan burst 429 yang bisa diatur. Server yang sama juga
+bisa dipakai sebagai "proxy" HTTP (request absolute-URI dijawab langsung),
+ditambah fake proxy lambat dan proxy mati.
+
+Contoh:
+    python mock_server.py --port 8765 --latency 50 --error-rate 0.02 \\
+        --burst-period 30 --burst-duration 2 --capacity 50 \\
+        --slow-proxy 8766:500 --dead-proxy 8767
+
+    TEAFI_BASE_URL=http://127.0.0.1:8765 PROXIES=127.0.0.1:8765,127.0.0.1:8766 python p.py
+"""
+import argparse
+import json
+import random
+import socket
+import threading
+import time
+from datetime import datetime, timezone, timedelta
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+
+class MockState:
+    """State check-in per wallet (in-memory)"""
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.wallets = {}  # address -> {'streak', 'totalPoints', 'lastCheckIn'}
+        self.requests = 0
+        self.active = 0  # request yang sedang diproses (untuk --capacity)
+    
+    @staticmethod
+    def current_day():
+        now = datetime.now(timezone.utc)
+        start = now.replace(hour=0, minute=0, second=0, microsecond=0)
+        end = start + timedelta(days=1) - timedelta(milliseconds=1)
+        return {
+            'start': start.isoformat(timespec='milliseconds').replace('+00:00', 'Z'),
+            'end': end.isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+        }
+    
+    def status(self, address):
+        with self.lock:
+            wallet = self.wallets.get(address, {'streak': 0, 'totalPoints': 0, 'lastCheckIn': None})
+            return dict(wallet, currentDay=self.current_day())
+    
+    def checkin(self, address):
+        """Return (True, result) jika berhasil, (False, None) jika sudah check-in hari ini"""
+        now = datetime.now(timezone.utc)
+        today = now.date().isoformat()
+        with self.lock:
+            wallet = self.wallets.setdefault(address, {'streak': 0, 'totalPoints': 0, 'lastCheckIn': None})
+            if wallet['lastCheckIn'] and wallet['lastCheckIn'].startswith(today):
+                return False, None
+            wallet['streak'] += 1
+            points = 10 * min(wallet['streak'], 7)
+            wallet['totalPoints'] += points
+            wallet['lastCheckIn'] = now.isoformat(timespec='milliseconds').replace('+00:00', 'Z')
+            return True, {'points': points, 'issuedDay': wallet['streak']}
+
+
+def make_handler(state, config, extra_latency=0.0):
+    """Buat request handler dengan config latency / error; extra_latency untuk fake proxy lambat"""
+    started = time.monotonic()
+    
+    class MockHandler(BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+        # Header dan body ditulis terpisah: tanpa TCP_NODELAY, Nagle + delayed ACK menambah ~40 ms per response
+        disable_nagle_algorithm = True
+        
+        def log_message(self, format, *args):
+            pass
+        
+        def send_json(self, code, body, headers=None):
+            payload = json.dumps(body).encode('utf-8')
+            self.send_response(code)
+            self.send_header('Content-Type', 'application/json')
+            self.send_header('Content-Length', str(len(payload)))
+            for key, value in (headers or {}).items():
+                self.send_header(key, value)
+            self.end_headers()
+            self.wfile.write(payload)
+        
+        def simulate(self):
+            """Latency + error injection. Return True jika response error sudah dikirim"""
+            with state.lock:
+                state.requests += 1
+                state.active += 1
+                active = state.active
+            try:
+                return self.simulate_response(active)
+            finally:
+                with state.lock:
+                    state.active -= 1
+        
+        def simulate_response(self, active):
+            latency = config.latency / 1000 + extra_latency
+            if config.jitter:
+                latency += random.uniform(0, config.jitter / 1000)
+            if config.capacity and active > config.capacity:
+                # Overload: latency naik sebanding beban, sebagian request ditolak 503
+                latency *= active / config.capacity
+                if random.random() < 1 - config.capacity / active:
+                    time.sleep(latency)
+                    self.send_json(503, {'message': 'Service overloaded'})
+                    return True
+            if latency > 0:
+                time.sleep(latency)
+            
+            if config.burst_period and (time.monotonic() - started) % config.burst_period < config.burst_duration:
+                self.send_json(429, {'message': 'Too Many Requests'}, {'Retry-After': str(config.retry_after)})
+                return True
+            
+            if config.error_rate and random.random() < config.error_rate:
+                self.send_json(random.choice((500, 502, 503)), {'message': 'Internal server error'})
+                return True
+            return False
+        
+        def route(self):
+            url = urlparse(self.path)
+            address = parse_qs(url.query).get('address', [''])[0]
+            return url.path, address
+        
+        def do_GET(self):
+            path, address = self.route()
+            if path != '/wallet/check-in/current':
+                self.send_json(404, {'message': 'Not found'})
+                return
+            if self.simulate():
+                return
+            self.send_json(200, state.status(address))
+        
+        def do_POST(self):
+            path, address = self.route()
+            length = int(self.headers.get('Content-Length') or 0)
+            if length:
+                self.rfile.read(length)
+            if path != '/wallet/check-in':
+                self.send_json(404, {'message': 'Not found'})
+                return
+            if self.simulate():
+                return
+            if not address:
+                self.send_json(400, {'message': 'Address is required'})
+                return
+            
+            ok, result = state.checkin(address)
+            if not ok:
+                self.send_json(400, {'message': 'Already checked in today'})
+                return
+            self.send_json(201, result)
+    
+    return MockHandler
+
+
+class MockHTTPServer(ThreadingHTTPServer):
+    # Backlog default (5) terlalu kecil untuk burst koneksi dari beberapa shard sekaligus
+    request_queue_size = 1024
+
+
+def start_server(host, port, handler):
+    server = MockHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def start_dead_proxy(host, port):
+    """Proxy mati: port listen tapi koneksi tidak pernah dilayani"""
+    sock = socket.socket(socket.AF_INET, socket.SOCK_STREAM)
+    sock.setsockopt(socket.SOL_SOCKET, socket.SO_REUSEADDR, 1)
+    sock.bind((host, port))
+    sock.listen(0)
+    return sock
+
+
+def parse_args(argv=None):
+    parser = argparse.ArgumentParser(description='Mock lokal API Tea-Fi')
+    parser.add_argument('--host', default='127.0.0.1')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--latency', type=float, default=20, help='latency dasar per request (ms)')
+    parser.add_argument('--jitter', type=float, default=10, help='tambahan latency acak 0..N ms')
+    parser.add_argument('--error-rate', type=float, default=0.0, help='peluang response 5xx (0..1)')
+    parser.add_argument('--burst-period', type=float, default=0, help='periode burst 429 (detik, 0 = off)')
+    parser.add_argument('--burst-duration', type=float, default=1, help='lama burst 429 di awal tiap periode (detik)')
+    parser.add_argument('--retry-after', type=int, default=1, help='nilai header Retry-After untuk 429')
+    parser.add_argument('--capacity', type=int, default=0,
+                        help='request bersamaan sebelum server overload (latency naik + 503), 0 = tanpa batas')
+    parser.add_argument('--slow-proxy', action='append', default=[], metavar='PORT:MS',
+                        help='fake proxy lambat di PORT dengan tambahan latency MS (bisa berulang)')
+    parser.add_argument('--dead-proxy', action='append', default=[], type=int, metavar='PORT',
+                        help='fake proxy mati di PORT (bisa berulang)')
+    return parser.parse_args(argv)
+
+
+def serve(config):
+    """Jalankan mock server + fake proxy sesuai config. Return list server/socket"""
+    state = MockState()
+    servers = [start_server(config.host, config.port, make_handler(state, config))]
+    for spec in config.slow_proxy:
+        port, delay = spec.split(':')
+        servers.append(start_server(config.host, int(port), make_handler(state, config, float(delay) / 1000)))
+    for port in config.dead_proxy:
+        servers.append(start_dead_proxy(config.host, port))
+    return state, servers
+
+
+def main(argv=None):
+    config = parse_args(argv)
+    state, _ = serve(config)
+    print(f"Mock Tea-Fi API listening on http://{config.host}:{config.port}", flush=True)
+    for spec in config.slow_proxy:
+        print(f"  slow proxy: {config.host}:{spec.split(':')[0]} (+{spec.split(':')[1]} ms)", flush=True)
+    for port in config.dead_proxy:
+        print(f"  dead proxy: {config.host}:{port}", flush=True)
+    
+    try:
+        while True:
+            time.sleep(3600)
+    except KeyboardInterrupt:
+        print(f"Stopped after {state.requests} requests")
+
+
+if __name__ == "__main__":
+    main()
@@ -1,23 +1,1259 @@
 import os
-import requests
 import json
 import time
 import random
-import schedule
+import signal
 from datetime import datetime, timezone, timedelta
 from dotenv import load_dotenv
 import threading
-from concurrent.futures import ThreadPoolExecutor, as_completed
+import logging
+import logging.handlers
+import queue
+import atexit
+import sqlite3
+import heapq
+from collections import deque
+from functools import cached_property
 import sys
 
+# requests, asyncio, concurrent.futures dll. di-import di tempat pemakaiannya supaya
+# subcommand ringan (stats, status satu wallet) tidak membayar import yang tidak dipakai
+
 load_dotenv()
 
-class TeaFiAutoClaim:
+logger = logging.getLogger('teafi')
+wallet_logger = logging.getLogger('teafi.wallet')  # Log per wallet, bisa dimatikan di production
+
+class JsonLogFormatter(logging.Formatter):
+    """Format log sebagai satu object JSON per baris"""
+    def format(self, record):
+        entry = {
+            'time': datetime.fromtimestamp(record.created, timezone.utc).isoformat(),
+            'level': record.levelname,
+            'logger': record.name,
+            'message': record.getMessage().strip()
+        }
+        if record.exc_info:
+            entry['exc_info'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+_log_listener = None
+
+def setup_logging(prefix='', stream=None):
+    """Setup logging sekali per proses (prefix dipakai worker sharded, mis. '[shard 1/4] ').
+    
+    Worker thread hanya memasukkan record ke queue; satu background thread
+    (QueueListener) yang menulis ke stdout, jadi worker tidak berebut stdout.
+    Config: LOG_LEVEL, LOG_FORMAT (text/json), LOG_WALLET_DETAILS.
+    """
+    global _log_listener
+    if _log_listener is not None:
+        # Process pool bisa memakai ulang worker untuk shard lain: cukup ganti prefix
+        if prefix:
+            for handler in _log_listener.handlers:
+                if not isinstance(handler.formatter, JsonLogFormatter):
+                    handler.setFormatter(logging.Formatter(prefix.replace('%', '%%') + '%(message)s'))
+        return
+    
+    handler = logging.StreamHandler(stream or sys.stdout)
+    if os.getenv('LOG_FORMAT', 'text').lower() == 'json':
+        handler.setFormatter(JsonLogFormatter())
+    else:
+        handler.setFormatter(logging.Formatter(prefix.replace('%', '%%') + '%(message)s'))
+    
+    log_queue = queue.SimpleQueue()
+    logger.addHandler(logging.handlers.QueueHandler(log_queue))
+    logger.setLevel(os.getenv('LOG_LEVEL', 'INFO').upper())
+    logger.propagate = False
+    
+    # Detail per wallet (status, proxy, points) hanya tampil jika LOG_WALLET_DETAILS=true
+    if os.getenv('LOG_WALLET_DETAILS', 'true').lower() != 'true':
+        wallet_logger.setLevel(logging.WARNING)
+    
+    _log_listener = logging.handlers.QueueListener(log_queue, handler)
+    _log_listener.start()
+    atexit.register(_log_listener.stop)
+
+class TokenBucket:
+    """Token bucket thread-safe untuk membatasi rate check-in POST"""
+    def __init__(self, rate, burst=1):
+        self.rate = rate  # token per detik, <= 0 berarti tanpa limit
+        self.burst = max(1, burst)
+        self.tokens = float(self.burst)
+        self.updated = time.monotonic()
+        self.lock = threading.Lock()
+    
+    def _refill(self):
+        now = time.monotonic()
+        self.tokens = min(self.burst, self.tokens + (now - self.updated) * self.rate)
+        self.updated = now
+    
+    def try_acquire(self):
+        """Ambil token jika ada. Return 0 jika berhasil, atau detik sampai token berikutnya tersedia"""
+        if self.rate <= 0:
+            return 0
+        
+        with self.lock:
+            self._refill()
+            if self.tokens >= 1:
+                self.tokens -= 1
+                return 0
+            return (1 - self.tokens) / self.rate
+    
+    def reserve(self):
+        """Pesan token berikutnya (boleh minus). Return detik yang harus ditunggu pemanggil"""
+        if self.rate <= 0:
+            return 0
+        
+        with self.lock:
+            self._refill()
+            self.tokens -= 1
+            if self.tokens >= 0:
+                return 0
+            return -self.tokens / self.rate
+    
+    def cancel(self):
+        """Kembalikan token dari reserve() yang tidak jadi dipakai (mis. wallet di-drop)"""
+        if self.rate <= 0:
+            return
+        
+        with self.lock:
+            self._refill()
+            self.tokens = min(self.burst, self.tokens + 1)
+
+def format_proxy(proxy):
+    """Ubah 'host:port' / URL proxy menjadi dict proxies untuk requests"""
+    if not proxy.startswith('http'):
+        proxy = f'http://{proxy}'
+    return {
+        'http': proxy,
+        'https': proxy
+    }
+
+def iter_source_rows(path):
+    """Baca file sumber (newline atau CSV) baris per baris secara lazy.
+    
+    Baris kosong dan komentar '#' dilewati, begitu juga header CSV yang
+    kolom pertamanya 'wallet' / 'address' / 'proxy'.
+    """
+    import csv
+    with open(path, newline='', encoding='utf-8') as source:
+        for row in csv.reader(source):
+            row = [col.strip() for col in row]
+            if not row or not row[0] or row[0].startswith('#'):
+                continue
+            if row[0].lower() in ('wallet', 'address', 'proxy'):
+                continue
+            yield row
+
+def display_proxy(proxy):
+    """Tampilkan proxy tanpa kredensial"""
+    proxy_display = proxy['http']
+    if '@' in proxy_display:
+        proxy_display = proxy_display.split('@')[-1]
+    return proxy_display
+
+def parse_api_time(value):
+    """Parse timestamp ISO dari API (mis. 2024-01-01T00:00:00.000Z) ke datetime UTC"""
+    if not value:
+        return None
+    try:
+        parsed = datetime.fromisoformat(value.replace('Z', '+00:00'))
+    except ValueError:
+        return None
+    if parsed.tzinfo is None:
+        parsed = parsed.replace(tzinfo=timezone.utc)
+    return parsed
+
+class RetryPolicy:
+    """Klasifikasi error check-in dan backoff eksponensial dengan jitter.
+    
+    Timeout/network error, 5xx, 408, 425 dan 429 dianggap bisa di-retry; 4xx
+    lainnya (mis. sudah check-in, address tidak valid) langsung final.
+    """
+    RETRYABLE_STATUS = {408, 425, 429}
+    
+    def __init__(self, base_delay=2.0, max_delay=60.0):
+        self.base_delay = base_delay
+        self.max_delay = max_delay
+    
+    def is_retryable(self, status_code=None, error=None):
+        if error is not None:
+            # Hanya cek module yang memang sudah di-import oleh engine yang berjalan
+            network_errors = [OSError, TimeoutError]
+            if 'requests' in sys.modules:
+                network_errors.append(sys.modules['requests'].exceptions.RequestException)
+            if 'asyncio' in sys.modules:
+                network_errors.append(sys.modules['asyncio'].TimeoutError)
+            return isinstance(error, tuple(network_errors))
+        return status_code in self.RETRYABLE_STATUS or (status_code is not None and status_code >= 500)
+    
+    def backoff(self, attempt, retry_after=None):
+        """Full jitter: random(0, min(cap, base * 2^attempt)), Retry-After jadi batas bawah"""
+        delay = random.uniform(0, min(self.max_delay, self.base_delay * (2 ** attempt)))
+        if retry_after is not None:
+            delay = max(delay, min(retry_after, self.max_delay))
+        return delay
+    
+    @staticmethod
+    def parse_retry_after(value):
+        """Parse header Retry-After (detik atau HTTP date) ke detik"""
+        if not value:
+            return None
+        try:
+            return max(0.0, float(value))
+        except ValueError:
+            pass
+        try:
+            from email.utils import parsedate_to_datetime
+            retry_at = parsedate_to_datetime(value)
+        except (TypeError, ValueError):
+            return None
+        if retry_at.tzinfo is None:
+            retry_at = retry_at.replace(tzinfo=timezone.utc)
+        return max(0.0, (retry_at - datetime.now(timezone.utc)).total_seconds())
+
+class RunBudget:
+    """Batas waktu total satu run (RUN_BUDGET detik, 0 = tanpa batas).
+    
+    Menjelang deadline, timeout request dipendekkan ke sisa waktu, retry
+    yang backoff-nya melewati deadline dibatalkan, dan wallet yang belum
+    mulai di-drop supaya run selesai tepat waktu.
+    """
+    MIN_TIMEOUT = 0.5  # Request baru hanya dimulai jika sisa waktu minimal segini
+    
+    def __init__(self, seconds=0, until=None):
+        # until = deadline absolut (time.time()) dari coordinator sharded, menggantikan seconds
+        # supaya waktu spawn worker ikut terhitung
+        self.seconds = seconds
+        if until is not None:
+            self.deadline = time.monotonic() + (until - time.time())
+        else:
+            self.deadline = time.monotonic() + seconds if seconds > 0 else None
+    
+    def remaining(self):
+        """Sisa detik (None jika tanpa batas)"""
+        if self.deadline is None:
+            return None
+        return max(0.0, self.deadline - time.monotonic())
+    
+    def expired(self):
+        """True jika sisa waktu tidak cukup lagi untuk memulai request baru"""
+        return self.deadline is not None and self.deadline - time.monotonic() < self.MIN_TIMEOUT
+    
+    def allows_wait(self, seconds):
+        """True jika setelah menunggu `seconds` masih ada waktu untuk satu request"""
+        remaining = self.remaining()
+        return remaining is None or remaining - seconds >= self.MIN_TIMEOUT
+    
+    def timeouts(self, connect_timeout, request_timeout):
+        """(connect, read) timeout dipotong ke sisa waktu run"""
+        remaining = self.remaining()
+        if remaining is None:
+            return connect_timeout, request_timeout
+        limit = max(self.MIN_TIMEOUT, remaining)
+        return min(connect_timeout, limit), min(request_timeout, limit)
+
+class AdaptiveLimit:
+    """Batas request in-flight yang diatur otomatis dengan AIMD.
+    
+    Response sehat menaikkan limit +1/limit (kira-kira +1 per putaran penuh
+    request). 429/5xx/read timeout, atau latency EWMA di atas baseline x
+    tolerance, memotong limit dengan faktor backoff, maksimal sekali per
+    putaran supaya satu burst error tidak memotong berkali-kali.
+    """
+    WARMUP = 50
+    
+    def __init__(self, initial, minimum=1, maximum=100, backoff=0.5, latency_tolerance=2.0):
+        self.minimum = max(1, minimum)
+        self.maximum = max(self.minimum, maximum)
+        self.value = float(min(max(initial, self.minimum), self.maximum))
+        self.backoff = backoff
+        self.latency_tolerance = latency_tolerance
+        self.latency = None   # EWMA latency response terbaru
+        self.baseline = None  # latency "normal" (EWMA terendah, naik pelan)
+        self.since_decrease = self.maximum  # response sejak pemotongan terakhir
+        self.samples = 0      # sinyal latency baru dipakai setelah WARMUP sample (koneksi awal lambat)
+        self.lock = threading.Lock()
+    
+    @property
+    def limit(self):
+        return int(self.value)
+    
+    def record(self, latency=None, overloaded=False):
+        """Catat satu response (atau timeout jika overloaded tanpa latency)"""
+        with self.lock:
+            if latency is not None:
+                self.samples += 1
+                self.latency = latency if self.latency is None else 0.8 * self.latency + 0.2 * latency
+                if self.baseline is None or self.latency < self.baseline:
+                    self.baseline = self.latency
+                else:
+                    self.baseline += (self.latency - self.baseline) * 0.01
+            
+            self.since_decrease += 1
+            congested = overloaded or (
+                self.samples > self.WARMUP and self.latency > self.baseline * self.latency_tolerance
+            )
+            if not congested:
+                self.value = min(self.maximum, self.value + 1 / self.value)
+            elif self.since_decrease >= self.value:
+                self.value = max(self.minimum, self.value * self.backoff)
+                self.since_decrease = 0
+                logger.debug(f"Concurrency limit turun ke {self.limit}")
+
+class CheckinLedger:
+    """Ledger lokal (SQLite) berisi check-in terakhir setiap wallet.
+    
+    Wallet yang tercatat sudah check-in di window currentDay yang sedang
+    berjalan (atau di hari UTC ini jika window tidak diketahui) bisa di-skip
+    tanpa request status ke API.
+    """
+    def __init__(self, path):
+        self.path = path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self.lock, self.conn:
+            # WAL supaya beberapa process (CLAIM_MODE=sharded) bisa menulis bersamaan
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS checkins ("
+                " wallet TEXT PRIMARY KEY,"
+                " checked_in_at TEXT NOT NULL,"
+                " issued_day TEXT,"
+                " points INTEGER,"
+                " day_start TEXT,"
+                " day_end TEXT)"
+            )
+    
+    def record(self, wallet, checked_in_at=None, issued_day=None, points=None, current_day=None):
+        """Catat check-in wallet (menimpa catatan sebelumnya)"""
+        checked_in_at = checked_in_at or datetime.now(timezone.utc).isoformat()
+        current_day = current_day or {}
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT OR REPLACE INTO checkins VALUES (?, ?, ?, ?, ?, ?)",
+                (wallet, checked_in_at, None if issued_day is None else str(issued_day), points,
+                 current_day.get('start'), current_day.get('end'))
+            )
+    
+    def is_checked_in_today(self, wallet):
+        """True jika wallet sudah check-in di window hari ini"""
+        with self.lock:
+            row = self.conn.execute(
+                "SELECT checked_in_at, day_start, day_end FROM checkins WHERE wallet = ?", (wallet,)
+            ).fetchone()
+        if not row:
+            return False
+        
+        checked_in_at, day_start, day_end = map(parse_api_time, row)
+        now = datetime.now(timezone.utc)
+        
+        # Pakai window currentDay dari API jika ada
+        if day_start and day_end:
+            return day_start <= checked_in_at < day_end and now < day_end
+        
+        return checked_in_at is not None and checked_in_at.date() == now.date()
+    
+    def windows(self):
+        """wallet -> (day_start, day_end) window currentDay terakhir yang tercatat"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT wallet, day_start, day_end FROM checkins WHERE day_start IS NOT NULL AND day_end IS NOT NULL"
+            ).fetchall()
+        return {wallet: (parse_api_time(start), parse_api_time(end)) for wallet, start, end in rows}
+    
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+class WorkQueue:
+    """Sumber wallet untuk engine claim: urutan prioritas dan second pass.
+    
+    Tanpa priority, wallet di-stream sesuai urutan sumber. Dengan priority,
+    semua wallet dibaca dulu lalu diurutkan (mis. deadline window dan
+    riwayat gagal). Wallet yang gagal bisa di-defer dan diproses sekali lagi
+    setelah semua wallet lain selesai. Iterator ini bisa dipanggil lagi
+    setelah StopIteration, jadi wallet yang di-defer belakangan tetap terambil.
+    """
+    def __init__(self, source, priority=None, second_pass=False, budget=None):
+        self.second_pass = second_pass
+        self.budget = budget  # RunBudget: setelah deadline tidak ada wallet baru yang diberikan
+        self.deferred = deque()
+        self.retried = set()     # wallet yang sudah masuk second pass
+        self.second_pass_started = False
+        self.handed_out = {}     # wallet -> wallet_data yang sedang diproses
+        self.heap = None
+        self.source = iter(source)
+        if priority:
+            self.heap = [(priority(wallet_data), seq, wallet_data) for seq, wallet_data in enumerate(self.source)]
+            heapq.heapify(self.heap)
+    
+    def __iter__(self):
+        return self
+    
+    def __next__(self):
+        if self.budget and self.budget.expired():
+            raise StopIteration
+        wallet_data = self.next_first_pass()
+        if wallet_data is None:
+            if not self.deferred:
+                raise StopIteration
+            if not self.second_pass_started:
+                self.second_pass_started = True
+                logger.info(f"ðŸ”„ Second pass: memproses ulang wallet yang gagal ({len(self.deferred)} antri)")
+            wallet_data = self.deferred.popleft()
+        self.handed_out[wallet_data[0]] = wallet_data
+        return wallet_data
+    
+    def next_first_pass(self):
+        if self.heap is not None:
+            return heapq.heappop(self.heap)[2] if self.heap else None
+        return next(self.source, None)
+    
+    def defer(self, wallet):
+        """Tunda wallet gagal ke second pass. Return False jika tidak bisa (sudah pernah / nonaktif)"""
+        wallet_data = self.handed_out.pop(wallet, None)
+        if not self.second_pass or wallet_data is None or wallet in self.retried:
+            return False
+        self.retried.add(wallet)
+        self.deferred.append(wallet_data)
+        return True
+    
+    def done(self, wallet):
+        self.handed_out.pop(wallet, None)
+    
+    def drain(self):
+        """Sisa wallet yang belum diberikan (termasuk antrian second pass), untuk dilaporkan sebagai dropped"""
+        while True:
+            wallet_data = self.next_first_pass()
+            if wallet_data is None:
+                break
+            yield wallet_data
+        while self.deferred:
+            yield self.deferred.popleft()
+
+class RunJournal:
+    """Journal run hari ini (JSONL, append-only), ditulis setiap wallet selesai.
+    
+    Jika proses mati di tengah run, run berikutnya di hari UTC yang sama
+    hanya mengulang wallet yang belum selesai atau gagal. fsync:
+    'always' (tiap record), 'batch' (paling lama tiap interval detik) atau
+    'off' (hanya flush, aman dari crash proses tapi tidak dari mati listrik).
+    """
+    DONE_STATUSES = ('success', 'skipped')
+    
+    def __init__(self, path, fsync='batch', fsync_interval=1.0):
+        self.path = path
+        self.fsync = fsync
+        self.fsync_interval = fsync_interval
+        self.day = datetime.now(timezone.utc).date().isoformat()
+        self.done = set()
+        self.lock = threading.Lock()
+        
+        resumed = self.load()
+        # Journal hari lain (atau rusak) dibuang, mulai journal baru
+        self.file = open(path, 'a' if resumed else 'w', encoding='utf-8')
+        self.last_sync = time.monotonic()
+    
+    def load(self):
+        """Baca journal lama. Return True jika journal milik hari ini"""
+        try:
+            with open(self.path, encoding='utf-8') as journal:
+                lines = journal.read().splitlines()
+        except FileNotFoundError:
+            return False
+        
+        for line in lines:
+            try:
+                record = json.loads(line)
+            except ValueError:
+                continue  # Baris terakhir bisa terpotong saat crash
+            if record.get('day') != self.day:
+                self.done.clear()
+                return False
+            if record.get('status') in self.DONE_STATUSES:
+                self.done.add(record['wallet'])
+        return bool(lines)
+    
+    def is_done(self, wallet):
+        return wallet in self.done
+    
+    def record(self, result):
+        with self.lock:
+            if result['wallet'] in self.done:
+                return
+            if result['status'] in self.DONE_STATUSES:
+                self.done.add(result['wallet'])
+            self.file.write(json.dumps({'day': self.day, 'wallet': result['wallet'], 'status': result['status']}) + '\n')
+            self.file.flush()
+            if self.fsync == 'always' or (
+                    self.fsync == 'batch' and time.monotonic() - self.last_sync >= self.fsync_interval):
+                self.sync()
+    
+    def sync(self):
+        os.fsync(self.file.fileno())
+        self.last_sync = time.monotonic()
+    
+    def close(self):
+        with self.lock:
+            if self.fsync != 'off':
+                self.file.flush()
+                self.sync()
+            self.file.close()
+
+class HistoryStore:
+    """Riwayat run di SQLite: satu baris per run, total harian per wallet dan per proxy.
+    
+    Dipakai untuk statistik kumulatif yang tetap ada setelah restart, dan
+    query murah seperti points per wallet atau failure rate per proxy
+    dalam N hari terakhir.
+    """
+    def __init__(self, path, batch_size=100):
+        self.path = path
+        self.batch_size = batch_size
+        self.pending = []  # baris wallet_days yang belum ditulis (write lock SQLite tidak ditahan antar call)
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self.lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS runs ("
+                " id INTEGER PRIMARY KEY AUTOINCREMENT,"
+                " started_at TEXT NOT NULL,"
+                " finished_at TEXT NOT NULL,"
+                " mode TEXT,"
+                " success INTEGER NOT NULL,"
+                " skipped INTEGER NOT NULL,"
+                " failed INTEGER NOT NULL,"
+                " points INTEGER NOT NULL)"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS wallet_days ("
+                " wallet TEXT NOT NULL,"
+                " day TEXT NOT NULL,"
+                " status TEXT NOT NULL,"
+                " points INTEGER NOT NULL DEFAULT 0,"
+                " failures INTEGER NOT NULL DEFAULT 0,"
+                " PRIMARY KEY (wallet, day))"
+            )
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS proxy_days ("
+                " proxy TEXT NOT NULL,"
+                " day TEXT NOT NULL,"
+                " requests INTEGER NOT NULL DEFAULT 0,"
+                " failures INTEGER NOT NULL DEFAULT 0,"
+                " PRIMARY KEY (proxy, day))"
+            )
+            self.conn.execute("CREATE INDEX IF NOT EXISTS wallet_days_day ON wallet_days (day)")
+    
+    @staticmethod
+    def today():
+        return datetime.now(timezone.utc).date().isoformat()
+    
+    @staticmethod
+    def since(days):
+        return (datetime.now(timezone.utc).date() - timedelta(days=max(1, days) - 1)).isoformat()
+    
+    def record_wallet(self, result):
+        """Tambahkan result satu wallet ke total harian (ditulis per batch)"""
+        failed = 1 if result['status'] == 'failed' else 0
+        with self.lock:
+            self.pending.append((result['wallet'], self.today(), result['status'], result.get('points') or 0, failed))
+            if len(self.pending) >= self.batch_size:
+                self.flush_locked()
+    
+    def flush(self):
+        with self.lock:
+            self.flush_locked()
+    
+    def flush_locked(self):
+        """Tulis buffer wallet_days dalam satu transaksi pendek (shard lain bisa menulis di antaranya)"""
+        if not self.pending:
+            return
+        with self.conn:
+            self.conn.executemany(
+                "INSERT INTO wallet_days (wallet, day, status, points, failures) VALUES (?, ?, ?, ?, ?)"
+                " ON CONFLICT (wallet, day) DO UPDATE SET status = excluded.status,"
+                " points = points + excluded.points, failures = failures + excluded.failures",
+                self.pending
+            )
+        self.pending = []
+    
+    def record_proxies(self, health):
+        """Tambahkan counter request/gagal per proxy dari satu run (dict label -> (requests, failures))"""
+        rows = [(proxy, self.today(), requests, failures)
+                for proxy, (requests, failures) in health.items() if requests]
+        with self.lock:
+            self.flush_locked()
+            with self.conn:
+                self.conn.executemany(
+                    "INSERT INTO proxy_days VALUES (?, ?, ?, ?)"
+                    " ON CONFLICT (proxy, day) DO UPDATE SET requests = requests + excluded.requests,"
+                    " failures = failures + excluded.failures",
+                    rows
+                )
+    
+    def record_run(self, started_at, mode, results):
+        with self.lock, self.conn:
+            self.conn.execute(
+                "INSERT INTO runs (started_at, finished_at, mode, success, skipped, failed, points)"
+                " VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (started_at.isoformat(), datetime.now(timezone.utc).isoformat(), mode,
+                 results['success'], results['skipped'], results['failed'], results['points'])
+            )
+    
+    def totals(self):
+        """Statistik kumulatif semua run"""
+        with self.lock:
+            runs, success, points, last_run = self.conn.execute(
+                "SELECT COUNT(*), COALESCE(SUM(success), 0), COALESCE(SUM(points), 0), MAX(finished_at) FROM runs"
+            ).fetchone()
+        return {'total_runs': runs, 'total_success': success, 'total_points': points,
+                'last_run': parse_api_time(last_run)}
+    
+    def wallet_points(self, days=7, limit=None, lowest=False):
+        """(wallet, points, failures) dalam N hari terakhir, urut points terbanyak (atau terendah)"""
+        order = 'ASC' if lowest else 'DESC'
+        query = ("SELECT wallet, SUM(points), SUM(failures) FROM wallet_days WHERE day >= ?"
+                 f" GROUP BY wallet ORDER BY SUM(points) {order}, SUM(failures) DESC")
+        params = [self.since(days)]
+        if limit:
+            query += " LIMIT ?"
+            params.append(limit)
+        with self.lock:
+            return self.conn.execute(query, params).fetchall()
+    
+    def recent_failures(self, days=7):
+        """wallet -> jumlah gagal dalam N hari terakhir (hanya wallet yang pernah gagal)"""
+        with self.lock:
+            return dict(self.conn.execute(
+                "SELECT wallet, SUM(failures) FROM wallet_days WHERE day >= ? AND failures > 0 GROUP BY wallet",
+                (self.since(days),)
+            ).fetchall())
+    
+    def proxy_failure_rates(self, days=7):
+        """(proxy, requests, failures, failure rate) dalam N hari terakhir, urut failure rate tertinggi"""
+        with self.lock:
+            rows = self.conn.execute(
+                "SELECT proxy, SUM(requests), SUM(failures) FROM proxy_days WHERE day >= ? GROUP BY proxy",
+                (self.since(days),)
+            ).fetchall()
+        rates = [(proxy, requests, failures, failures / requests) for proxy, requests, failures in rows]
+        return sorted(rates, key=lambda row: row[3], reverse=True)
+    
+    def close(self):
+        with self.lock:
+            self.conn.commit()
+            self.conn.close()
+
+class StatusCache:
+    """Cache response status wallet (SQLite) dengan TTL untuk subcommand status.
+    
+    Refresh dashboard dalam TTL dilayani dari cache tanpa request ke API,
+    jadi monitoring tidak berebut rate limit dengan claim.
+    """
+    CHUNK = 500  # Batas jumlah parameter per query SQLite
+    
+    def __init__(self, path, ttl):
+        self.ttl = ttl
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self.lock, self.conn:
+            self.conn.execute("PRAGMA journal_mode=WAL")
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS status_cache ("
+                " wallet TEXT PRIMARY KEY,"
+                " fetched_at REAL NOT NULL,"
+                " body TEXT NOT NULL)"
+            )
+    
+    def get_many(self, wallets):
+        """wallet -> (status dict, umur detik) untuk entry yang masih dalam TTL"""
+        fresh = {}
+        oldest = time.time() - self.ttl
+        wallets = list(wallets)
+        with self.lock:
+            for start in range(0, len(wallets), self.CHUNK):
+                chunk = wallets[start:start + self.CHUNK]
+                rows = self.conn.execute(
+                    f"SELECT wallet, fetched_at, body FROM status_cache"
+                    f" WHERE fetched_at >= ? AND wallet IN ({','.join('?' * len(chunk))})",
+                    [oldest] + chunk
+                ).fetchall()
+                for wallet, fetched_at, body in rows:
+                    fresh[wallet] = (json.loads(body), time.time() - fetched_at)
+        return fresh
+    
+    def put_many(self, statuses):
+        """Simpan dict wallet -> status dict"""
+        now = time.time()
+        with self.lock, self.conn:
+            self.conn.executemany(
+                "INSERT OR REPLACE INTO status_cache VALUES (?, ?, ?)",
+                [(wallet, now, json.dumps(info)) for wallet, info in statuses.items()]
+            )
+    
+    def close(self):
+        with self.lock:
+            self.conn.close()
+
+class SessionPool:
+    """Pool requests.Session per proxy.
+    
+    Setiap proxy punya session sendiri dengan HTTPAdapter berukuran sesuai
+    concurrency, sehingga koneksi keep-alive (dan TLS) bisa dipakai ulang
+    antara status GET dan check-in POST tanpa berebut dengan proxy lain.
+    """
+    def __init__(self, headers, pool_size):
+        self.headers = headers
+        self.pool_size = max(1, pool_size)
+        self.sessions = {}
+        self.lock = threading.Lock()
+    
+    def get(self, proxy=None):
+        """Ambil session untuk proxy (None = koneksi langsung), buat jika belum ada"""
+        key = proxy['http'] if proxy else None
+        session = self.sessions.get(key)
+        if session is not None:
+            return session
+        
+        import requests
+        from requests.adapters import HTTPAdapter
+        
+        with self.lock:
+            session = self.sessions.get(key)
+            if session is None:
+                session = requests.Session()
+                session.headers.update(self.headers)
+                adapter = HTTPAdapter(pool_connections=1, pool_maxsize=self.pool_size)
+                session.mount('https://', adapter)
+                session.mount('http://', adapter)
+                self.sessions[key] = session
+        return session
+    
+    def close(self):
+        with self.lock:
+            for session in self.sessions.values():
+                session.close()
+            self.sessions.clear()
+
+class ProxyPool:
+    """Pool proxy dengan health tracking.
+    
+    Mencatat success rate dan latency (EWMA) per proxy. Proxy yang gagal
+    connect berturut-turut sebanyak max_failures ditandai unhealthy, dan
+    wallet yang di-mapping ke proxy itu dipindah ke proxy sehat dengan
+    latency terendah sampai akhir run.
+    """
+    def __init__(self, proxies, max_failures=3):
+        self.proxies = proxies
+        self.max_failures = max(1, max_failures)
+        self.lock = threading.Lock()
+        self.reset()
+    
+    def __len__(self):
+        return len(self.proxies)
+    
+    @staticmethod
+    def new_health():
+        return {
+            'success': 0,
+            'failed': 0,
+            'consecutive_failures': 0,
+            'latency': None,
+            'healthy': True,
+            'reassigned': 0
+        }
+    
+    def reset(self):
+        """Reset health dan assignment (dipanggil di awal setiap run)"""
+        with self.lock:
+            self.known = {proxy['http']: proxy for proxy in self.proxies}
+            self.health = {key: self.new_health() for key in self.known}
+            self.assignments = {}  # wallet index -> proxy dari mapping file / pengganti
+    
+    def pin(self, wallet_index, proxy):
+        """Pasang proxy khusus untuk wallet (kolom proxy di WALLETS_FILE)"""
+        with self.lock:
+            key = proxy['http']
+            if key not in self.known:
+                self.known[key] = proxy
+                self.health[key] = self.new_health()
+            self.assignments[wallet_index] = self.known[key]
+    
+    def get(self, wallet_index):
+        """Proxy untuk wallet: mapping/rotasi index, atau pengganti jika proxy aslinya unhealthy"""
+        with self.lock:
+            proxy = self.assignments.get(wallet_index)
+            if proxy is None:
+                if not self.proxies:
+                    return None
+                proxy = self.proxies[wallet_index % len(self.proxies)]
+            if self.health[proxy['http']]['healthy']:
+                return proxy
+            
+            replacement = self._best_healthy()
+            if replacement is None:
+                # Semua proxy unhealthy, tetap pakai mapping asli
+                return proxy
+            
+            self.assignments[wallet_index] = replacement
+            self.health[replacement['http']]['reassigned'] += 1
+            return replacement
+    
+    def _best_healthy(self):
+        """Proxy sehat dengan skor latency x beban pindahan terendah"""
+        healthy = [proxy for proxy in self.proxies if self.health[proxy['http']]['healthy']]
+        if not healthy:
+            return None
+        
+        known = [self.health[p['http']]['latency'] for p in healthy if self.health[p['http']]['latency']]
+        default_latency = sum(known) / len(known) if known else 1.0
+        
+        def score(proxy):
+            health = self.health[proxy['http']]
+            return (health['latency'] or default_latency) * (health['reassigned'] + 1)
+        
+        return min(healthy, key=score)
+    
+    def record_success(self, proxy, latency):
+        if not proxy:
+            return
+        with self.lock:
+            health = self.health.get(proxy['http'])
+            if health is None:
+                return
+            health['success'] += 1
+            health['consecutive_failures'] = 0
+            if health['latency'] is None:
+                health['latency'] = latency
+            else:
+                health['latency'] = 0.3 * latency + 0.7 * health['latency']
+    
+    def record_failure(self, proxy, connect_error=False):
+        if not proxy:
+            return
+        with self.lock:
+            health = self.health.get(proxy['http'])
+            if health is None:
+                return
+            health['failed'] += 1
+            if not connect_error:
+                return
+            
+            health['consecutive_failures'] += 1
+            if health['healthy'] and health['consecutive_failures'] >= self.max_failures:
+                health['healthy'] = False
+                logger.warning(f"âš ï¸ Proxy {display_proxy(proxy)} ditandai unhealthy "
+                      f"setelah {health['consecutive_failures']} kali gagal connect")
+    
+    def unhealthy(self):
+        """List proxy yang sedang unhealthy"""
+        with self.lock:
+            return [proxy for key, proxy in self.known.items() if not self.health[key]['healthy']]
+
+def metric_endpoint(method):
+    """Label endpoint metrics dari HTTP method (GET status, POST check-in)"""
+    return 'status' if method == 'GET' else 'checkin'
+
+class Metrics:
+    """Metrics claim run dalam format teks Prometheus.
+    
+    - teafi_request_duration_seconds: histogram latency per endpoint & proxy
+    - teafi_request_errors_total: request yang gagal tanpa response
+    - teafi_wallets_total: hasil wallet (success / skipped / failed)
+    - teafi_retries_total: jumlah retry check-in
+    - teafi_requests_in_flight: request yang sedang berjalan
+    - teafi_concurrency_limit: limit ADAPTIVE_CONCURRENCY saat ini
+    """
+    BUCKETS = (0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+    
     def __init__(self):
-        self.base_url = "https://api.tea-fi.com"
-        self.wallets = self.load_wallets()
-        self.proxies_list = self.load_proxies_list()
-        self.session = requests.Session()
+        self.lock = threading.Lock()
+        self.histograms = {}  # (endpoint, proxy) -> [count per bucket..., count total, sum]
+        self.counters = {}    # (name, labels) -> value
+        self.in_flight = 0
+        self.gauges = {}  # name -> value
+        self.server = None
+    
+    def observe(self, endpoint, proxy, seconds):
+        with self.lock:
+            histogram = self.histograms.get((endpoint, proxy))
+            if histogram is None:
+                histogram = self.histograms[(endpoint, proxy)] = [0] * (len(self.BUCKETS) + 2)
+            for i, bound in enumerate(self.BUCKETS):
+                if seconds <= bound:
+                    histogram[i] += 1
+            histogram[-2] += 1
+            histogram[-1] += seconds
+    
+    def inc(self, name, amount=1, **labels):
+        key = (name, tuple(sorted(labels.items())))
+        with self.lock:
+            self.counters[key] = self.counters.get(key, 0) + amount
+    
+    def set_gauge(self, name, value):
+        with self.lock:
+            self.gauges[name] = value
+    
+    def add_in_flight(self, delta):
+        with self.lock:
+            self.in_flight += delta
+    
+    @staticmethod
+    def format_labels(labels):
+        if not labels:
+            return ''
+        pairs = []
+        for key, value in labels:
+            value = str(value).replace('\\', '\\\\').replace('"', '\\"')
+            pairs.append(f'{key}="{value}"')
+        return '{' + ','.join(pairs) + '}'
+    
+    def render(self):
+        """Render semua metrics ke format teks Prometheus"""
+        with self.lock:
+            histograms = {key: list(value) for key, value in self.histograms.items()}
+            counters = dict(self.counters)
+            in_flight = self.in_flight
+            gauges = dict(self.gauges)
+        
+        lines = [
+            '# HELP teafi_request_duration_seconds Latency request ke API Tea-Fi',
+            '# TYPE teafi_request_duration_seconds histogram',
+        ]
+        for (endpoint, proxy), histogram in sorted(histograms.items()):
+            labels = [('endpoint', endpoint), ('proxy', proxy)]
+            for bound, count in zip(self.BUCKETS, histogram):
+                lines.append(f"teafi_request_duration_seconds_bucket{self.format_labels(labels + [('le', bound)])} {count}")
+            lines.append(f"teafi_request_duration_seconds_bucket{self.format_labels(labels + [('le', '+Inf')])} {histogram[-2]}")
+            lines.append(f"teafi_request_duration_seconds_sum{self.format_labels(labels)} {histogram[-1]:.6f}")
+            lines.append(f"teafi_request_duration_seconds_count{self.format_labels(labels)} {histogram[-2]}")
+        
+        for name in sorted({name for name, _ in counters}):
+            lines.append(f"# TYPE teafi_{name}_total counter")
+            for (counter_name, labels), value in sorted(counters.items()):
+                if counter_name == name:
+                    lines.append(f"teafi_{name}_total{self.format_labels(labels)} {value}")
+        
+        lines.append('# TYPE teafi_requests_in_flight gauge')
+        lines.append(f"teafi_requests_in_flight {in_flight}")
+        for name, value in sorted(gauges.items()):
+            lines.append(f"# TYPE teafi_{name} gauge")
+            lines.append(f"teafi_{name} {value}")
+        return '\n'.join(lines) + '\n'
+    
+    def dump(self, path):
+        """Tulis metrics ke file (replace atomic)"""
+        tmp_path = f"{path}.tmp"
+        with open(tmp_path, 'w', encoding='utf-8') as output:
+            output.write(self.render())
+        os.replace(tmp_path, path)
+    
+    def serve(self, host, port):
+        """Jalankan endpoint /metrics lokal di background thread"""
+        from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+        metrics = self
+        
+        class MetricsHandler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                if self.path.split('?')[0] not in ('/', '/metrics'):
+                    self.send_error(404)
+                    return
+                body = metrics.render().encode('utf-8')
+                self.send_response(200)
+                self.send_header('Content-Type', 'text/plain; version=0.0.4')
+                self.send_header('Content-Length', str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, format, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer((host, port), MetricsHandler)
+        threading.Thread(target=self.server.serve_forever, name='metrics-server', daemon=True).start()
+        logger.info(f"ðŸ“ˆ Metrics endpoint: http://{host}:{port}/metrics")
+
+class ResultSink:
+    """Tujuan result per wallet, ditulis segera setelah wallet selesai"""
+    def write(self, result):
+        raise NotImplementedError
+    
+    def close(self):
+        pass
+
+class JsonlResultSink(ResultSink):
+    """Append satu baris JSON per wallet"""
+    def __init__(self, path):
+        self.lock = threading.Lock()
+        self.file = open(path, 'a', encoding='utf-8')
+    
+    def write(self, result):
+        line = json.dumps(dict(result, time=datetime.now(timezone.utc).isoformat()), default=str)
+        with self.lock:
+            self.file.write(line + '\n')
+    
+    def close(self):
+        with self.lock:
+            self.file.close()
+
+class SqliteResultSink(ResultSink):
+    """Simpan result ke tabel SQLite, commit per batch"""
+    def __init__(self, path, batch_size=100):
+        self.lock = threading.Lock()
+        self.batch_size = batch_size
+        self.pending = 0
+        self.run_started = datetime.now(timezone.utc).isoformat()
+        self.conn = sqlite3.connect(path, timeout=30, check_same_thread=False)
+        with self.lock, self.conn:
+            self.conn.execute(
+                "CREATE TABLE IF NOT EXISTS results ("
+                " run_started TEXT NOT NULL,"
+                " finished_at TEXT NOT NULL,"
+                " wallet TEXT NOT NULL,"
+                " status TEXT NOT NULL,"
+                " points INTEGER,"
+                " issued_day TEXT,"
+                " message TEXT)"
+            )
+    
+    def write(self, result):
+        issued_day = result.get('issued_day')
+        with self.lock:
+            self.conn.execute(
+                "INSERT INTO results VALUES (?, ?, ?, ?, ?, ?, ?)",
+                (self.run_started, datetime.now(timezone.utc).isoformat(), result['wallet'],
+                 result['status'], result.get('points'),
+                 None if issued_day is None else str(issued_day), result.get('message'))
+            )
+            self.pending += 1
+            if self.pending >= self.batch_size:
+                self.conn.commit()
+                self.pending = 0
+    
+    def close(self):
+        with self.lock:
+            self.conn.commit()
+            self.conn.close()
+
+RESULT_SINKS = {
+    'jsonl': (JsonlResultSink, 'results.jsonl'),
+    'sqlite': (SqliteResultSink, 'results.db'),
+}
+
+def default_result_sink_path(kind):
+    return RESULT_SINKS[kind][1] if kind in RESULT_SINKS else ''
+
+def create_result_sink(kind, path):
+    """Buat result sink sesuai RESULT_SINK ('' / 'none' = tanpa sink)"""
+    if not kind or kind == 'none':
+        return None
+    if kind not in RESULT_SINKS:
+        raise ValueError(f"RESULT_SINK tidak dikenal: {kind} (pilihan: {', '.join(RESULT_SINKS)})")
+    return RESULT_SINKS[kind][0](path)
+
+class ClaimDispatcher:
+    """Scheduler pusat untuk parallel mode.
+    
+    Worker thread hanya dipakai selama request berjalan: status GET di-submit
+    selama antrian POST belum penuh, sedangkan check-in POST baru di-submit
+    saat token bucket mengizinkan. Retry dijadwalkan ulang di sini dengan backoff, sehingga
+    tidak ada worker yang tidur menunggu giliran.
+    """
+    def __init__(self, claimer, executor, max_in_flight, concurrency=None):
+        self.claimer = claimer
+        self.executor = executor
+        self.max_in_flight = max_in_flight
+        self.concurrency = concurrency  # AdaptiveLimit opsional, menggantikan max_in_flight
+        self.ready = deque()  # (wallet_data, attempt) yang menunggu token untuk POST
+        self.delayed = []     # heap (due, seq, wallet_data, attempt) untuk retry
+        self.in_flight = {}   # future -> (phase, wallet_data, attempt)
+        self.dropped = []     # wallet_data yang di-drop karena RUN_BUDGET habis
+        self.seq = 0
+    
+    def submit(self, phase, wallet_data, attempt=0):
+        if phase == 'status':
+            future = self.executor.submit(self.claimer.prepare_wallet, wallet_data)
+        else:
+            future = self.executor.submit(self.claimer.claim_wallet, wallet_data, attempt)
+        self.in_flight[future] = (phase, wallet_data, attempt)
+    
+    def schedule_retry(self, wallet_data, attempt, delay):
+        self.seq += 1
+        heapq.heappush(self.delayed, (time.monotonic() + delay, self.seq, wallet_data, attempt))
+    
+    def fill(self, pending):
+        """Isi slot kosong. Return detik sampai token/retry berikutnya (None jika tidak ada yang ditunggu)"""
+        budget = self.claimer.budget
+        if budget.expired():
+            # RUN_BUDGET habis: wallet yang masih menunggu token / retry di-drop
+            for wallet_data, _ in self.ready:
+                self.dropped.append(wallet_data)
+            for _, _, wallet_data, _ in self.delayed:
+                self.dropped.append(wallet_data)
+            self.ready.clear()
+            self.delayed.clear()
+            return None
+        
+        # Retry yang sudah jatuh tempo masuk antrian POST
+        now = time.monotonic()
+        while self.delayed and self.delayed[0][0] <= now:
+            _, _, wallet_data, attempt = heapq.heappop(self.delayed)
+            self.ready.append((wallet_data, attempt))
+        timeout = self.delayed[0][0] - now if self.delayed else None
+        
+        limit = self.concurrency.limit if self.concurrency else self.max_in_flight
+        while len(self.in_flight) < limit:
+            if self.ready:
+                wait_time = self.claimer.rate_limiter.try_acquire()
+                if wait_time <= 0:
+                    wallet_data, attempt = self.ready.popleft()
+                    self.submit('checkin', wallet_data, attempt)
+                    continue
+                timeout = wait_time if timeout is None else min(timeout, wait_time)
+                if len(self.ready) >= limit:
+                    # Antrian POST sudah penuh: status GET wallet baru ditunda sampai ada token,
+                    # supaya ready tidak tumbuh O(fleet) dan status tidak basi sebelum di-POST
+                    break
+            
+            wallet_data = next(pending, None)
+            if wallet_data is None:
+                break
+            self.submit('status', wallet_data)
+        
+        remaining = budget.remaining()
+        if remaining is not None and (self.ready or self.delayed):
+            timeout = remaining if timeout is None else min(timeout, remaining)
+        return timeout
+    
+    def run(self, wallet_data, on_result):
+        """Jalankan semua wallet sampai selesai, panggil on_result untuk setiap result"""
+        from concurrent.futures import wait, FIRST_COMPLETED
+        pending = iter(wallet_data)
+        
+        while True:
+            timeout = self.fill(pending)
+            while self.dropped:
+                on_result(self.claimer.dropped_result(self.dropped.pop()[0]))
+            
+            if not self.in_flight:
+                if not self.ready and not self.delayed:
+                    break
+                time.sleep(timeout)
+                continue
+            
+            done, _ = wait(list(self.in_flight), timeout=timeout, return_when=FIRST_COMPLETED)
+            for future in done:
+                phase, (wallet, index), attempt = self.in_flight.pop(future)
+                try:
+                    result = future.result()
+                except Exception as e:
+                    logger.error(f"âŒ Exception untuk wallet {wallet[:8]}...: {str(e)}")
+                    result = {'status': 'failed', 'wallet': wallet, 'message': str(e)}
+                
+                if phase == 'status' and result is None:
+                    # Wallet perlu check-in, antri token
+                    self.ready.append(((wallet, index), 0))
+                    continue
+                
+                if result['status'] == 'retry':
+                    self.schedule_retry((wallet, index), attempt + 1, result['retry_in'])
+                    continue
+                
+                on_result(result)
+
+class DailyScheduler:
+    """Scheduler harian berbasis event, deadline dihitung dalam UTC.
+    
+    Loop tidur dengan satu Event.wait sampai deadline berikutnya (tanpa
+    polling per detik) dan langsung bangun saat SIGTERM/SIGINT (shutdown)
+    atau SIGUSR1 (run sekarang).
+    """
+    MAX_WAIT = 3600  # Hitung ulang deadline minimal tiap jam (jaga-jaga jam sistem berubah)
+    
+    def __init__(self, run_time):
+        self.run_hour, self.run_minute = map(int, run_time.split(':'))
+        self.wakeup = threading.Event()
+        self.stop_requested = False
+        self.run_requested = False
+    
+    def next_run(self, now=None):
+        """Deadline run berikutnya (datetime UTC)"""
+        now = now or datetime.now(timezone.utc)
+        next_run = now.replace(hour=self.run_hour, minute=self.run_minute, second=0, microsecond=0)
+        if next_run <= now:
+            next_run += timedelta(days=1)
+        return next_run
+    
+    def install_signal_handlers(self):
+        """Pasang handler signal (hanya bisa dari main thread)"""
+        if threading.current_thread() is not threading.main_thread():
+            return
+        signal.signal(signal.SIGTERM, self.handle_stop)
+        signal.signal(signal.SIGINT, self.handle_stop)
+        if hasattr(signal, 'SIGUSR1'):
+            signal.signal(signal.SIGUSR1, self.handle_run)
+    
+    def handle_stop(self, signum, frame):
+        if self.stop_requested:
+            # Signal kedua: berhenti paksa
+            raise KeyboardInterrupt
+        self.stop_requested = True
+        logger.info("\nâš ï¸ Stop diminta, scheduler berhenti setelah run yang sedang berjalan "
+                    "(Ctrl+C sekali lagi untuk berhenti paksa)")
+        self.wakeup.set()
+    
+    def handle_run(self, signum, frame):
+        self.run_requested = True
+        self.wakeup.set()
+    
+    def wait_until(self, deadline, on_tick=None):
+        """Tunggu sampai deadline. Return 'due', 'run' (SIGUSR1) atau 'stop'.
+        
+        on_tick (opsional) dipanggil dengan sisa detik; jika ada, loop bangun
+        tiap detik untuk menggambar countdown.
+        """
+        while True:
+            if self.stop_requested:
+                return 'stop'
+            if self.run_requested:
+                self.run_requested = False
+                self.wakeup.clear()
+                return 'run'
+            
+            remaining = (deadline - datetime.now(timezone.utc)).total_seconds()
+            if remaining <= 0:
+                return 'due'
+            
+            if on_tick:
+                on_tick(remaining)
+                timeout = min(remaining, 1)
+            else:
+                timeout = min(remaining, self.MAX_WAIT)
+            
+            if self.wakeup.wait(timeout) and not (self.stop_requested or self.run_requested):
+                self.wakeup.clear()
+    
+    def sleep(self, seconds):
+        """Tidur yang bisa diputus signal stop / run"""
+        self.wakeup.wait(seconds)
+        if not self.stop_requested:
+            self.wakeup.clear()
+
+class TeaFiAutoClaim:
+    def __init__(self, shard=None, wallet_filter=None, run_deadline=None):
+        # shard = (index, jumlah shard) jika instance ini worker CLAIM_MODE=sharded
+        self.shard = shard
+        # run_deadline = deadline RUN_BUDGET absolut (time.time()) yang dihitung coordinator sharded
+        self.run_deadline = run_deadline
+        # wallet_filter = list address (CLI --wallet), hanya wallet itu yang diproses
+        self.wallet_filter = list(wallet_filter) if wallet_filter else None
+        setup_logging(f"[shard {shard[0] + 1}/{shard[1]}] " if shard else '')
+        self.base_url = os.getenv('TEAFI_BASE_URL', 'https://api.tea-fi.com').rstrip('/')
+        self.wallets_file = os.getenv('WALLETS_FILE', '')
+        # wallets, proxies_list, proxy_pool, ledger, history dan stats dibuat saat pertama dipakai
+        # (cached_property), jadi 'stats' / 'status -w X' tidak parse fleet atau membuat file ledger
         
         # Headers sesuai dengan request yang ditangkap
         self.headers = {
@@ -38,55 +1274,300 @@ class TeaFiAutoClaim:
         # Config
         self.claim_delay = int(os.getenv('CLAIM_DELAY', 5))
         self.max_workers = int(os.getenv('MAX_WORKERS', 3))
+        # ADAPTIVE_CONCURRENCY=true: MAX_WORKERS jadi nilai awal, limit parallel mode diatur AIMD
+        self.concurrency = None
+        if os.getenv('ADAPTIVE_CONCURRENCY', 'false').lower() == 'true':
+            self.concurrency = AdaptiveLimit(
+                self.max_workers,
+                minimum=int(os.getenv('ADAPTIVE_MIN_WORKERS', 1)),
+                maximum=int(os.getenv('ADAPTIVE_MAX_WORKERS') or self.max_workers * 4),
+                latency_tolerance=float(os.getenv('ADAPTIVE_LATENCY_TOLERANCE', 2.0))
+            )
+        self.async_concurrency = int(os.getenv('ASYNC_CONCURRENCY', 100))  # Max request in-flight (CLAIM_MODE=async)
+        self.shard_count = max(1, int(os.getenv('SHARDS') or os.cpu_count() or 1))  # CLAIM_MODE=sharded
+        self.shard_engine = os.getenv('SHARD_ENGINE', 'parallel').lower()
         self.retry_count = int(os.getenv('RETRY_COUNT', 2))
+        # Batas waktu total per run (detik, 0 = tanpa batas), budget baru dibuat setiap run
+        self.run_budget = float(os.getenv('RUN_BUDGET') or 0)
+        self.budget = RunBudget()
+        self.retry_policy = RetryPolicy(float(os.getenv('RETRY_BASE_DELAY', 2)),
+                                        float(os.getenv('RETRY_MAX_DELAY', 60)))
+        
+        # Rate limit check-in POST (default: 1 request per CLAIM_DELAY detik)
+        default_rate = 1 / self.claim_delay if self.claim_delay > 0 else 0
+        self.claim_rate = float(os.getenv('CLAIM_RATE', default_rate))  # request per detik, 0 = tanpa limit
+        self.claim_burst = int(os.getenv('CLAIM_BURST', 1))
+        if self.shard:
+            # CLAIM_RATE berlaku untuk seluruh fleet: tiap shard hanya dapat bagiannya
+            self.claim_rate /= self.shard[1]
+            self.claim_burst = max(1, self.claim_burst // self.shard[1])
+        self.rate_limiter = TokenBucket(self.claim_rate, self.claim_burst)
+        
+        # Satu session (connection pool) per proxy, ukuran pool mengikuti jumlah worker
+        self.session_pool = SessionPool(self.headers, self.concurrency.maximum if self.concurrency else self.max_workers)
+        
+        # Timeout: connect dibuat pendek supaya proxy mati cepat ketahuan
+        self.connect_timeout = float(os.getenv('CONNECT_TIMEOUT', 10))
+        self.request_timeout = float(os.getenv('REQUEST_TIMEOUT', 30))
+        self.current_days = {}  # wallet -> currentDay window dari status terakhir
+        
+        # Urutan wallet: WALLET_PRIORITY=true mengurutkan by deadline window + riwayat gagal
+        self.wallet_priority = os.getenv('WALLET_PRIORITY', 'false').lower() == 'true'
+        # SECOND_PASS=true: wallet yang gagal diproses sekali lagi di akhir run
+        self.second_pass = os.getenv('SECOND_PASS', 'false').lower() == 'true'
+        self.work_queue = None
+        
+        # Journal run untuk resume setelah crash (kosongkan JOURNAL_PATH untuk menonaktifkan)
+        self.journal_path = self.shard_path(os.getenv('JOURNAL_PATH', 'run_journal.jsonl'))
+        self.journal_fsync = os.getenv('JOURNAL_FSYNC', 'batch').lower()
+        self.journal_fsync_interval = float(os.getenv('JOURNAL_FSYNC_INTERVAL', 1.0))
+        self.journal = None
+        
+        # Cache status untuk subcommand status (kosongkan STATUS_CACHE_PATH untuk menonaktifkan)
+        self.status_cache_path = os.getenv('STATUS_CACHE_PATH', 'teafi_status_cache.db')
+        self.status_cache_ttl = float(os.getenv('STATUS_CACHE_TTL', 300))
+        
+        # Langsung POST tanpa status GET; "already checked in" dihitung skip
+        self.speculative_checkin = os.getenv('SPECULATIVE_CHECKIN', 'false').lower() == 'true'
+        
+        # Result per wallet ditulis langsung ke sink (jsonl / sqlite), summary console dibatasi
+        self.result_sink_type = os.getenv('RESULT_SINK', '').lower()
+        self.result_sink_path = self.shard_path(
+            os.getenv('RESULT_SINK_PATH') or default_result_sink_path(self.result_sink_type))
+        self.summary_detail_limit = int(os.getenv('SUMMARY_DETAIL_LIMIT', 20))
+        self.result_sink = None
+        
+        # Metrics: histogram latency, counter, gauge in-flight
+        self.metrics = Metrics()
+        self.metrics_file = self.shard_path(os.getenv('METRICS_FILE', 'metrics.prom'))
+        self.metrics_port = int(os.getenv('METRICS_PORT') or 0)
+        if self.metrics_port and shard:
+            self.metrics_port += shard[0] + 1  # Port coordinator + 1 + index shard
         self.daily_run_time = os.getenv('DAILY_RUN_TIME', '00:01')  # Waktu run harian
         self.auto_restart = os.getenv('AUTO_RESTART', 'true').lower() == 'true'
         
-        # Statistics
-        self.stats = {
+        self.history_days = int(os.getenv('HISTORY_REPORT_DAYS', 7))
+    
+    @cached_property
+    def wallets(self):
+        return self.load_wallets()
+    
+    @cached_property
+    def proxies_list(self):
+        return self.load_proxies_list()
+    
+    @cached_property
+    def proxy_pool(self):
+        return ProxyPool(self.proxies_list, int(os.getenv('PROXY_MAX_FAILURES', 3)))
+    
+    @cached_property
+    def ledger(self):
+        """Ledger lokal check-in (kosongkan LEDGER_PATH untuk menonaktifkan)"""
+        ledger_path = os.getenv('LEDGER_PATH', 'teafi_ledger.db')
+        return CheckinLedger(ledger_path) if ledger_path else None
+    
+    @cached_property
+    def history(self):
+        """Riwayat run di HISTORY_PATH (kosongkan untuk menonaktifkan)"""
+        history_path = os.getenv('HISTORY_PATH', 'teafi_history.db')
+        return HistoryStore(history_path) if history_path else None
+    
+    @cached_property
+    def stats(self):
+        """Statistics (total kumulatif dibaca dari HISTORY_PATH jika aktif)"""
+        stats = {
             'total_runs': 0,
             'total_success': 0,
             'total_points': 0,
             'last_run': None,
-            'next_run': None
+            'next_run': None,
+            'concurrency_limit': None  # limit terakhir dari ADAPTIVE_CONCURRENCY
         }
+        if self.history:
+            stats.update(self.history.totals())
+        return stats
     
     def load_wallets(self):
-        """Load wallet addresses dari environment variable"""
+        """Load wallet addresses dari environment variable (kosong jika pakai WALLETS_FILE)"""
+        if self.wallets_file:
+            logger.info(f"ðŸ“¥ Wallets dibaca streaming dari {self.wallets_file}")
+            return []
+        
         wallets_str = os.getenv('WALLETS', '')
         wallets = [wallet.strip() for wallet in wallets_str.split(',') if wallet.strip()]
-        print(f"ðŸ“¥ Loaded {len(wallets)} wallets")
+        logger.info(f"ðŸ“¥ Loaded {len(wallets)} wallets")
         return wallets
     
-    def load_proxies_list(self):
-        """Load multiple proxies dari environment variable"""
-        proxies_str = os.getenv('PROXIES', '')
-        if not proxies_str:
-            return []
+    def iter_wallets(self):
+        """Generator (wallet, index) untuk run ini, dibatasi wallet_filter jika ada.
         
-        proxies = [proxy.strip() for proxy in proxies_str.split(',') if proxy.strip()]
+        Index tetap index di sumber wallet (rotasi proxy sama dengan run penuh).
+        Sumber berhenti dibaca setelah semua wallet filter ketemu; wallet di
+        luar sumber tetap diproses dengan index setelah wallet terakhir.
+        Filter dicocokkan ke seluruh sumber (bukan slice shard), jadi index
+        sama di semua shard dan tiap wallet hanya diproses satu shard.
+        """
+        if not self.wallet_filter:
+            yield from self.iter_source_wallets()
+            return
         
-        # Format proxies
-        formatted_proxies = []
-        for proxy in proxies:
-            if not proxy.startswith('http'):
-                proxy = f'http://{proxy}'
-            formatted_proxies.append({
-                'http': proxy,
-                'https': proxy
-            })
+        remaining = {wallet.lower(): wallet for wallet in self.wallet_filter}
+        next_index = 0
+        for wallet, index in self.iter_source_wallets(all_shards=True):
+            next_index = index + 1
+            if remaining.pop(wallet.lower(), None):
+                if self.in_shard(index):
+                    yield wallet, index
+                if not remaining:
+                    return
+        for offset, wallet in enumerate(remaining.values()):
+            if self.in_shard(next_index + offset):
+                yield wallet, next_index + offset
+    
+    def iter_source_wallets(self, all_shards=False):
+        """Generator (wallet, index) dari WALLETS_FILE secara lazy, atau dari WALLETS.
+        
+        Kolom kedua di WALLETS_FILE (opsional) adalah proxy khusus wallet itu.
+        all_shards=True ikut mengembalikan wallet milik shard lain.
+        """
+        if not self.wallets_file:
+            for i, wallet in enumerate(self.wallets):
+                if all_shards or self.in_shard(i):
+                    yield wallet, i
+            return
+        
+        for i, row in enumerate(iter_source_rows(self.wallets_file)):
+            if not self.in_shard(i):
+                if all_shards:
+                    yield row[0], i
+                continue
+            if len(row) > 1 and row[1]:
+                self.proxy_pool.pin(i, format_proxy(row[1]))
+            yield row[0], i
+    
+    def new_work_queue(self):
+        """Buat WorkQueue untuk run ini (dipanggil setelah proxy_pool.reset karena iter_wallets pin proxy)"""
+        priority = None
+        if self.wallet_priority:
+            windows = self.ledger.windows() if self.ledger else {}
+            failures = self.history.recent_failures(self.history_days) if self.history else {}
+            now = datetime.now(timezone.utc)
+            end_of_day = now.replace(hour=0, minute=0, second=0, microsecond=0) + timedelta(days=1)
+            
+            def priority(wallet_data):
+                wallet, index = wallet_data
+                deadline = self.next_deadline(windows.get(wallet), now) or end_of_day
+                return (deadline, -failures.get(wallet, 0), index)
+        
+        self.work_queue = WorkQueue(self.iter_wallets(), priority, self.second_pass, self.budget)
+        return self.work_queue
+    
+    @staticmethod
+    def next_deadline(window, now):
+        """Akhir window currentDay berikutnya yang belum di-check-in, diproyeksikan dari
+        window check-in terakhir di ledger"""
+        if not window or not window[0] or not window[1] or window[1] <= window[0]:
+            return None
+        day_start, day_end = window
+        length = day_end - day_start
+        day_end += length  # Window check-in terakhir sudah selesai
+        while day_end <= now:
+            day_end += length
+        return day_end
+    
+    def in_shard(self, wallet_index):
+        """True jika wallet milik shard ini (index global dipakai, jadi rotasi proxy tetap sama)"""
+        return self.shard is None or wallet_index % self.shard[1] == self.shard[0]
+    
+    def shard_path(self, path):
+        """Tambahkan suffix shard ke path output (result sink, metrics) supaya tidak bentrok"""
+        if not path or self.shard is None:
+            return path
+        return f"{path}.shard{self.shard[0]}"
+    
+    def has_wallets(self):
+        if self.wallet_filter:
+            return True
+        if self.wallets_file:
+            return os.path.exists(self.wallets_file)
+        return bool(self.wallets)
+    
+    def describe_wallet_source(self):
+        """Deskripsi jumlah / sumber wallet untuk header run"""
+        if self.wallet_filter:
+            return f"{len(self.wallet_filter)} wallet terpilih"
+        if self.wallets_file:
+            return f"streaming dari {self.wallets_file}"
+        return f"{len(self.wallets)} wallet(s)"
+    
+    def wallet_label(self, index):
+        """Label posisi wallet, mis. [3/10] (atau [3] untuk sumber streaming)"""
+        if self.wallets_file or index >= len(self.wallets):
+            return f"[{index + 1}]"
+        return f"[{index + 1}/{len(self.wallets)}]"
+    
+    def load_proxies_list(self):
+        """Load multiple proxies dari PROXIES_FILE atau environment variable"""
+        proxies_file = os.getenv('PROXIES_FILE', '')
+        if proxies_file:
+            proxies = (row[0] for row in iter_source_rows(proxies_file))
+        else:
+            proxies_str = os.getenv('PROXIES', '')
+            if not proxies_str:
+                return []
+            proxies = (proxy.strip() for proxy in proxies_str.split(',') if proxy.strip())
         
-        print(f"ðŸ”Œ Loaded {len(formatted_proxies)} proxies")
+        # Format proxies (rotasi butuh list, jadi proxy tetap dimuat semua)
+        formatted_proxies = [format_proxy(proxy) for proxy in proxies]
+        
+        logger.info(f"ðŸ”Œ Loaded {len(formatted_proxies)} proxies")
         return formatted_proxies
     
+    def describe_rate_limit(self):
+        """Deskripsi singkat rate limit untuk header run"""
+        if self.claim_rate <= 0:
+            return "unlimited"
+        return f"{self.claim_rate:g} check-in/detik (burst {self.claim_burst})"
+    
     def get_proxy_for_wallet(self, wallet_index):
-        """Dapatkan proxy untuk wallet tertentu (rotasi)"""
-        if not self.proxies_list:
-            return None
+        """Dapatkan proxy untuk wallet tertentu (rotasi, proxy unhealthy diganti)"""
+        return self.proxy_pool.get(wallet_index)
+    
+    def send_request(self, method, url, params, proxy=None):
+        """Kirim request lewat session milik proxy, catat health proxy dan metrics"""
+        import requests
+        session = self.session_pool.get(proxy)
+        endpoint = metric_endpoint(method)
+        proxy_label = display_proxy(proxy) if proxy else 'direct'
+        
+        self.metrics.add_in_flight(1)
+        started = time.monotonic()
+        try:
+            # proxies per request: session.proxies kalah dengan HTTP(S)_PROXY dari environment
+            response = session.request(method, url, params=params, proxies=proxy,
+                                       timeout=self.budget.timeouts(self.connect_timeout, self.request_timeout))
+        except requests.exceptions.ConnectionError:
+            # Termasuk ConnectTimeout dan ProxyError
+            self.proxy_pool.record_failure(proxy, connect_error=True)
+            self.metrics.inc('request_errors', endpoint=endpoint, proxy=proxy_label)
+            raise
+        except Exception as e:
+            self.proxy_pool.record_failure(proxy)
+            self.metrics.inc('request_errors', endpoint=endpoint, proxy=proxy_label)
+            if self.concurrency and isinstance(e, requests.exceptions.ReadTimeout):
+                self.concurrency.record(overloaded=True)
+            raise
+        finally:
+            self.metrics.add_in_flight(-1)
         
-        # Rotasi proxy berdasarkan index wallet
-        proxy_index = wallet_index % len(self.proxies_list)
-        return self.proxies_list[proxy_index]
+        latency = time.monotonic() - started
+        self.proxy_pool.record_success(proxy, latency)
+        self.metrics.observe(endpoint, proxy_label, latency)
+        if self.concurrency:
+            overloaded = response.status_code == 429 or response.status_code >= 500
+            self.concurrency.record(latency, overloaded)
+            self.metrics.set_gauge('concurrency_limit', self.concurrency.limit)
+        return response
     
     def get_current_checkin_status(self, wallet_address, proxy=None):
         """Cek status check-in terakhir untuk wallet"""
@@ -94,20 +1575,16 @@ class TeaFiAutoClaim:
         params = {'address': wallet_address}
         
         try:
-            if proxy:
-                response = self.session.get(url, params=params, headers=self.headers, 
-                                          proxies=proxy, timeout=30)
-            else:
-                response = self.session.get(url, params=params, headers=self.headers, timeout=30)
+            response = self.send_request('GET', url, params, proxy)
             
             if response.status_code == 200:
                 return response.json()
             else:
-                print(f"âŒ Gagal cek status untuk {wallet_address[:8]}...: HTTP {response.status_code}")
+                wallet_logger.warning(f"âŒ Gagal cek status untuk {wallet_address[:8]}...: HTTP {response.status_code}")
                 return None
                 
         except Exception as e:
-            print(f"âŒ Error cek status untuk {wallet_address[:8]}...: {str(e)}")
+            wallet_logger.warning(f"âŒ Error cek status untuk {wallet_address[:8]}...: {str(e)}")
             return None
     
     def is_already_checked_in_today(self, wallet_data):
@@ -134,65 +1611,68 @@ class TeaFiAutoClaim:
             return last_checkin_date == current_date
             
         except Exception as e:
-            print(f"âš ï¸  Warning parsing date: {e}")
+            logger.warning(f"âš ï¸  Warning parsing date: {e}")
             return False
     
-    def perform_checkin(self, wallet_address, proxy=None, retry=0):
-        """Melakukan check-in untuk wallet dengan retry mechanism"""
+    def perform_checkin(self, wallet_address, proxy=None):
+        """Melakukan satu kali check-in untuk wallet (retry diatur pemanggil lewat retry_policy)"""
         url = f"{self.base_url}/wallet/check-in"
         params = {'address': wallet_address}
         
         try:
-            if proxy:
-                response = self.session.post(url, params=params, headers=self.headers, 
-                                           proxies=proxy, timeout=30)
-            else:
-                response = self.session.post(url, params=params, headers=self.headers, timeout=30)
-            
-            if response.status_code == 201:
-                result = response.json()
+            response = self.send_request('POST', url, params, proxy)
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e) or type(e).__name__,
+                'retryable': self.retry_policy.is_retryable(error=e),
+                'retry_after': None,
+                'wallet': wallet_address
+            }
+        
+        return self.parse_checkin_response(wallet_address, response.status_code, response.text,
+                                           response.headers.get('Retry-After'))
+    
+    def parse_checkin_response(self, wallet_address, status_code, text, retry_after=None):
+        """Ubah response check-in menjadi result dict, termasuk klasifikasi retry"""
+        if status_code == 201:
+            try:
+                result = json.loads(text)
                 return {
                     'success': True,
                     'points': result.get('points', 0),
                     'issued_day': result.get('issuedDay', 'N/A'),
                     'wallet': wallet_address
                 }
-            else:
-                error_msg = f"HTTP {response.status_code}"
-                if response.text:
-                    try:
-                        error_data = response.json()
-                        error_msg = error_data.get('message', error_msg)
-                    except:
-                        error_msg = response.text[:100]
-                
-                # Retry logic
-                if retry < self.retry_count:
-                    delay = (retry + 1) * 2  # Exponential backoff
-                    print(f"   ðŸ”„ Retry {retry + 1}/{self.retry_count} dalam {delay} detik...")
-                    time.sleep(delay)
-                    return self.perform_checkin(wallet_address, proxy, retry + 1)
-                
+            except Exception as e:
                 return {
                     'success': False,
-                    'error': error_msg,
+                    'error': f"Response check-in tidak valid: {str(e)}",
+                    'retryable': False,
+                    'retry_after': None,
                     'wallet': wallet_address
                 }
-                
-        except Exception as e:
-            error_msg = str(e)
-            # Retry logic untuk network errors
-            if retry < self.retry_count:
-                delay = (retry + 1) * 2
-                print(f"   ðŸ”„ Retry {retry + 1}/{self.retry_count} dalam {delay} detik...")
-                time.sleep(delay)
-                return self.perform_checkin(wallet_address, proxy, retry + 1)
-            
-            return {
-                'success': False,
-                'error': error_msg,
-                'wallet': wallet_address
-            }
+        
+        error = self.extract_error_message(status_code, text)
+        return {
+            'success': False,
+            'error': error,
+            'retryable': self.retry_policy.is_retryable(status_code=status_code),
+            'retry_after': RetryPolicy.parse_retry_after(retry_after),
+            'already_checked_in': status_code in (400, 409) and 'already' in str(error).lower(),
+            'wallet': wallet_address
+        }
+    
+    def extract_error_message(self, status_code, text):
+        """Ambil pesan error dari response body (JSON 'message' atau raw text)"""
+        error_msg = f"HTTP {status_code}"
+        if text:
+            try:
+                error_data = json.loads(text)
+                error_msg = error_data.get('message', error_msg)
+            except:
+                error_msg = text[:100]
+        return error_msg
     
     def get_wallet_info(self, wallet_data):
         """Mendapatkan informasi wallet dengan error handling"""
@@ -219,294 +1699,865 @@ class TeaFiAutoClaim:
         
         return ", ".join(info) if info else "No information available"
     
-    def process_single_wallet(self, wallet_data):
-        """Process single wallet untuk threading"""
+    def check_ledger(self, wallet):
+        """Return result skipped jika journal/ledger lokal mencatat wallet sudah selesai hari ini"""
+        if self.journal and self.journal.is_done(wallet):
+            return {'status': 'skipped', 'wallet': wallet, 'message': 'Sudah selesai di run sebelumnya (journal)'}
+        if self.ledger and self.ledger.is_checked_in_today(wallet):
+            return {'status': 'skipped', 'wallet': wallet, 'message': 'Sudah check-in hari ini (ledger)'}
+        return None
+    
+    def remember_status(self, wallet, wallet_info):
+        """Simpan window currentDay, dan catat ke ledger jika wallet ternyata sudah check-in"""
+        current_day = wallet_info.get('currentDay') or None
+        if self.is_already_checked_in_today(wallet_info):
+            if self.ledger:
+                self.ledger.record(wallet, wallet_info.get('lastCheckIn'), current_day=current_day)
+            return True
+        
+        if current_day:
+            self.current_days[wallet] = current_day
+        return False
+    
+    def speculative_skip(self, wallet, result):
+        """SPECULATIVE_CHECKIN: result skipped jika POST ditolak karena wallet sudah check-in"""
+        if not result.get('already_checked_in'):
+            return None
+        if self.ledger:
+            self.ledger.record(wallet)
+        wallet_logger.info(f"   â­ï¸ Sudah check-in hari ini")
+        return {'status': 'skipped', 'wallet': wallet, 'message': 'Sudah check-in hari ini'}
+    
+    def confirm_status(self, wallet, wallet_info):
+        """SPECULATIVE_CHECKIN: POST gagal dengan response ambigu, cek status untuk memastikan.
+        Return result skipped jika ternyata wallet sudah check-in hari ini"""
+        self.metrics.inc('status_fallbacks')
+        if wallet_info and self.remember_status(wallet, wallet_info):
+            wallet_logger.info(f"   ðŸ“Š {self.get_wallet_info(wallet_info)}")
+            return {'status': 'skipped', 'wallet': wallet, 'message': 'Sudah check-in hari ini'}
+        return None
+    
+    def record_checkin(self, wallet, result):
+        """Catat check-in yang berhasil ke ledger"""
+        current_day = self.current_days.pop(wallet, None)
+        if self.ledger:
+            self.ledger.record(wallet, issued_day=result['issued_day'], points=result['points'],
+                               current_day=current_day)
+    
+    def prepare_wallet(self, wallet_data):
+        """Tahap 1: cek status wallet. Return result dict jika selesai (failed/skipped), None jika perlu check-in"""
         wallet, index = wallet_data
         proxy = self.get_proxy_for_wallet(index)
         
-        print(f"\n[{index + 1}/{len(self.wallets)}] Processing: {wallet[:10]}...{wallet[-6:]}")
+        # Skip tanpa HTTP jika ledger sudah mencatat check-in hari ini
+        ledger_result = self.check_ledger(wallet)
+        if ledger_result:
+            return ledger_result
+        
+        wallet_logger.info(f"\n{self.wallet_label(index)} Processing: {wallet[:10]}...{wallet[-6:]}")
         if proxy:
-            proxy_display = proxy['http']
-            if '@' in proxy_display:
-                proxy_display = proxy_display.split('@')[-1]
-            print(f"   ðŸ”Œ Using proxy: {proxy_display}")
+            wallet_logger.info(f"   ðŸ”Œ Using proxy: {display_proxy(proxy)}")
+        
+        # Mode speculative: status hanya dicek jika response POST ambigu
+        if self.speculative_checkin:
+            return None
         
         # Cek status saat ini
         wallet_info = self.get_current_checkin_status(wallet, proxy)
         
+        # Proxy baru saja ditandai unhealthy: coba sekali lagi lewat proxy pengganti
+        if wallet_info is None and proxy:
+            replacement = self.get_proxy_for_wallet(index)
+            if replacement is not proxy:
+                wallet_info = self.get_current_checkin_status(wallet, replacement)
+        
         if wallet_info is None:
             return {'status': 'failed', 'wallet': wallet, 'message': 'Gagal mendapatkan data'}
         
-        print(f"   ðŸ“Š {self.get_wallet_info(wallet_info)}")
+        wallet_logger.info(f"   ðŸ“Š {self.get_wallet_info(wallet_info)}")
         
         # Cek apakah sudah check-in hari ini
-        if self.is_already_checked_in_today(wallet_info):
+        if self.remember_status(wallet, wallet_info):
             return {'status': 'skipped', 'wallet': wallet, 'message': 'Sudah check-in hari ini'}
         
-        # Hitung waktu tunggu berdasarkan index (staggered timing)
-        wait_time = index * self.claim_delay
-        if wait_time > 0:
-            print(f"   â° Menunggu {wait_time} detik sebelum claim...")
-            for i in range(wait_time, 0, -1):
-                print(f"   ðŸ•’ {i}...", end='\r', flush=True)
-                time.sleep(1)
-            print("   ðŸš€ Memulai claim...")
+        return None
+    
+    def claim_wallet(self, wallet_data, attempt=0):
+        """Tahap 2: lakukan check-in POST (token rate limit sudah diambil oleh pemanggil).
+        
+        Jika error bisa di-retry dan jatah retry masih ada, return result
+        dengan status 'retry' dan 'retry_in' (detik); pemanggil yang
+        menjadwalkan ulang, worker tidak ikut tidur.
+        """
+        wallet, index = wallet_data
+        proxy = self.get_proxy_for_wallet(index)
         
-        # Lakukan check-in
         result = self.perform_checkin(wallet, proxy)
         
         if result['success']:
-            print(f"   âœ… Check-in berhasil!")
-            print(f"   ðŸŽ Points earned: {result['points']}")
-            print(f"   ðŸ“… Issued: {result['issued_day']}")
+            self.record_checkin(wallet, result)
+            wallet_logger.info(f"   âœ… Check-in berhasil!")
+            wallet_logger.info(f"   ðŸŽ Points earned: {result['points']}")
+            wallet_logger.info(f"   ðŸ“… Issued: {result['issued_day']}")
             return {
                 'status': 'success', 
                 'wallet': wallet, 
                 'points': result['points'],
                 'issued_day': result['issued_day']
             }
-        else:
-            print(f"   âŒ Gagal check-in: {result['error']}")
-            return {'status': 'failed', 'wallet': wallet, 'message': result['error']}
+        
+        if self.speculative_checkin:
+            skipped = self.speculative_skip(wallet, result)
+            if skipped:
+                return skipped
+        
+        delay = self.retry_policy.backoff(attempt, result['retry_after'])
+        if result['retryable'] and attempt < self.retry_count and self.budget.allows_wait(delay):
+            wallet_logger.warning(f"   ðŸ”„ Retry {attempt + 1}/{self.retry_count} dalam {delay:.1f} detik... ({result['error']})")
+            self.metrics.inc('retries')
+            return {'status': 'retry', 'wallet': wallet, 'message': result['error'], 'retry_in': delay}
+        
+        if self.speculative_checkin:
+            skipped = self.confirm_status(wallet, self.get_current_checkin_status(wallet, proxy))
+            if skipped:
+                return skipped
+        
+        wallet_logger.warning(f"   âŒ Gagal check-in: {result['error']}")
+        return {'status': 'failed', 'wallet': wallet, 'message': result['error']}
+    
+    def process_single_wallet(self, wallet_data):
+        """Process single wallet (status + check-in) secara blocking"""
+        result = self.prepare_wallet(wallet_data)
+        if result is not None:
+            return result
+        
+        attempt = 0
+        while True:
+            # Tunggu giliran dari token bucket (menggantikan index * CLAIM_DELAY)
+            wait_time = self.rate_limiter.reserve()
+            if not self.budget.allows_wait(wait_time):
+                self.rate_limiter.cancel()
+                return self.dropped_result(wallet_data[0])
+            if wait_time > 0:
+                wallet_logger.info(f"   â° Menunggu {wait_time:.1f} detik sebelum claim...")
+                time.sleep(wait_time)
+            
+            result = self.claim_wallet(wallet_data, attempt)
+            if result['status'] != 'retry':
+                return result
+            
+            time.sleep(result['retry_in'])
+            attempt += 1
     
     def run_sequential_claim(self):
         """Menjalankan claim secara sequential dengan timing teratur"""
-        if not self.wallets:
-            print("âŒ Tidak ada wallet yang dikonfigurasi!")
+        if not self.has_wallets():
+            logger.error("âŒ Tidak ada wallet yang dikonfigurasi!")
             return
         
-        print(f"ðŸš€ Memulai Sequential Auto Claim Tea-Fi")
-        print(f"ðŸ“Š Total: {len(self.wallets)} wallet(s)")
-        print(f"ðŸ”Œ Proxies: {len(self.proxies_list)} available")
-        print(f"â° Delay antar wallet: {self.claim_delay} detik")
-        print(f"ðŸ”„ Max retry: {self.retry_count}")
-        print("-" * 60)
+        logger.info(f"ðŸš€ Memulai Sequential Auto Claim Tea-Fi")
+        logger.info(f"ðŸ“Š Total: {self.describe_wallet_source()}")
+        logger.info(f"ðŸ”Œ Proxies: {len(self.proxies_list)} available")
+        logger.info(f"â° Rate limit: {self.describe_rate_limit()}")
+        logger.info(f"ðŸ”„ Max retry: {self.retry_count}")
+        logger.info("-" * 60)
         
-        results = {
-            'success': 0,
-            'skipped': 0,
-            'failed': 0,
-            'details': []
-        }
+        results = self.new_results()
         
         start_time = datetime.now()
+        self.proxy_pool.reset()
         
-        for i, wallet in enumerate(self.wallets):
-            result = self.process_single_wallet((wallet, i))
-            results['details'].append(result)
-            
-            if result['status'] == 'success':
-                results['success'] += 1
-            elif result['status'] == 'skipped':
-                results['skipped'] += 1
-            else:
-                results['failed'] += 1
+        for wallet_data in self.new_work_queue():
+            result = self.process_single_wallet(wallet_data)
+            self.tally_result(results, result)
+        
+        self.drop_remaining(results)
         
         # Summary
         self.print_summary(results, start_time)
+        self.close_result_sink()
         
         # Update statistics
-        self.update_stats(results)
+        self.update_stats(results, start_time)
+        self.dump_metrics()
         return results
     
     def run_parallel_claim(self):
         """Menjalankan claim secara parallel dengan thread pool"""
-        if not self.wallets:
-            print("âŒ Tidak ada wallet yang dikonfigurasi!")
+        if not self.has_wallets():
+            logger.error("âŒ Tidak ada wallet yang dikonfigurasi!")
             return
         
-        print(f"ðŸš€ Memulai Parallel Auto Claim Tea-Fi")
-        print(f"ðŸ“Š Total: {len(self.wallets)} wallet(s)")
-        print(f"ðŸ”Œ Proxies: {len(self.proxies_list)} available")
-        print(f"ðŸ§µ Workers: {self.max_workers}")
-        print(f"ðŸ”„ Max retry: {self.retry_count}")
-        print("-" * 60)
+        logger.info(f"ðŸš€ Memulai Parallel Auto Claim Tea-Fi")
+        logger.info(f"ðŸ“Š Total: {self.describe_wallet_source()}")
+        logger.info(f"ðŸ”Œ Proxies: {len(self.proxies_list)} available")
+        if self.concurrency:
+            logger.info(f"ðŸ§µ Workers: adaptive, mulai {self.concurrency.limit} "
+                        f"({self.concurrency.minimum}-{self.concurrency.maximum})")
+        else:
+            logger.info(f"ðŸ§µ Workers: {self.max_workers}")
+        logger.info(f"â° Rate limit: {self.describe_rate_limit()}")
+        logger.info(f"ðŸ”„ Max retry: {self.retry_count}")
+        logger.info("-" * 60)
         
-        results = {
-            'success': 0,
-            'skipped': 0,
-            'failed': 0,
-            'details': []
-        }
+        results = self.new_results()
         
         start_time = datetime.now()
+        self.proxy_pool.reset()
         
-        # Prepare wallet data dengan index
-        wallet_data = [(wallet, i) for i, wallet in enumerate(self.wallets)]
+        from concurrent.futures import ThreadPoolExecutor
+        max_workers = self.concurrency.maximum if self.concurrency else self.max_workers
+        with ThreadPoolExecutor(max_workers=max_workers) as executor:
+            dispatcher = ClaimDispatcher(self, executor, self.max_workers, self.concurrency)
+            dispatcher.run(self.new_work_queue(), lambda result: self.tally_result(results, result))
         
-        with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
-            future_to_wallet = {
-                executor.submit(self.process_single_wallet, data): data 
-                for data in wallet_data
-            }
-            
-            for future in as_completed(future_to_wallet):
-                try:
-                    result = future.result()
-                    results['details'].append(result)
-                    
-                    if result['status'] == 'success':
-                        results['success'] += 1
-                    elif result['status'] == 'skipped':
-                        results['skipped'] += 1
-                    else:
-                        results['failed'] += 1
-                        
-                except Exception as e:
-                    wallet_data = future_to_wallet[future]
-                    print(f"âŒ Exception untuk wallet {wallet_data[0][:8]}...: {str(e)}")
-                    results['failed'] += 1
-                    results['details'].append({
-                        'status': 'failed', 
-                        'wallet': wallet_data[0], 
-                        'message': str(e)
-                    })
+        self.drop_remaining(results)
         
         # Summary
         self.print_summary(results, start_time)
+        self.close_result_sink()
         
         # Update statistics
-        self.update_stats(results)
+        self.update_stats(results, start_time)
+        self.dump_metrics()
         return results
     
+    def run_async_claim(self):
+        """Menjalankan claim secara async (satu thread, banyak request in-flight)"""
+        if not self.has_wallets():
+            logger.error("âŒ Tidak ada wallet yang dikonfigurasi!")
+            return
+        
+        logger.info(f"ðŸš€ Memulai Async Auto Claim Tea-Fi")
+        logger.info(f"ðŸ“Š Total: {self.describe_wallet_source()}")
+        logger.info(f"ðŸ”Œ Proxies: {len(self.proxies_list)} available")
+        logger.info(f"ðŸ§µ Concurrency: {self.async_concurrency}")
+        logger.info(f"â° Rate limit: {self.describe_rate_limit()}")
+        logger.info(f"ðŸ”„ Max retry: {self.retry_count}")
+        logger.info("-" * 60)
+        
+        results = self.new_results()
+        
+        start_time = datetime.now()
+        self.proxy_pool.reset()
+        
+        import asyncio
+        asyncio.run(self._run_async_claim(results))
+        
+        self.drop_remaining(results)
+        
+        # Summary
+        self.print_summary(results, start_time)
+        self.close_result_sink()
+        
+        # Update statistics
+        self.update_stats(results, start_time)
+        self.dump_metrics()
+        return results
+    
+    async def _run_async_claim(self, results):
+        """Event loop utama untuk async claim"""
+        import asyncio
+        try:
+            import aiohttp
+        except ImportError:
+            raise RuntimeError("CLAIM_MODE=async membutuhkan aiohttp (pip install aiohttp)")
+        
+        # Semaphore membatasi jumlah request yang sedang berjalan
+        semaphore = asyncio.Semaphore(self.async_concurrency)
+        connector = aiohttp.TCPConnector(limit=self.async_concurrency)
+        timeout = aiohttp.ClientTimeout(total=self.request_timeout, sock_connect=self.connect_timeout)
+        
+        async with aiohttp.ClientSession(headers=self.headers, connector=connector,
+                                         timeout=timeout) as session:
+            # Task dibuat bertahap dari sumber wallet (streaming), jumlah task dibatasi
+            max_pending = self.async_concurrency * 2
+            pending = set()
+            work_queue = self.new_work_queue()
+            
+            while True:
+                # Queue diambil ulang setiap ada task selesai (wallet second pass masuk belakangan)
+                for wallet_data in work_queue:
+                    pending.add(asyncio.create_task(self.async_process_single_wallet(session, semaphore, wallet_data)))
+                    if len(pending) >= max_pending:
+                        break
+                if not pending:
+                    break
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                for task in done:
+                    self.tally_result(results, task.result())
+    
+    async def async_send_request(self, session, semaphore, method, url, params, proxy=None):
+        """Versi async dari send_request. Return (status_code, body text, header Retry-After)"""
+        import aiohttp
+        
+        endpoint = metric_endpoint(method)
+        proxy_label = display_proxy(proxy) if proxy else 'direct'
+        
+        async with semaphore:
+            # Timeout dihitung setelah dapat slot, dipotong ke sisa RUN_BUDGET
+            connect_timeout, request_timeout = self.budget.timeouts(self.connect_timeout, self.request_timeout)
+            timeout = aiohttp.ClientTimeout(total=request_timeout, sock_connect=connect_timeout)
+            self.metrics.add_in_flight(1)
+            started = time.monotonic()
+            try:
+                async with session.request(method, url, params=params, timeout=timeout,
+                                           proxy=proxy['http'] if proxy else None) as response:
+                    status_code = response.status
+                    text = await response.text()
+                    retry_after = response.headers.get('Retry-After')
+            except (aiohttp.ClientConnectorError, aiohttp.ServerTimeoutError):
+                # Gagal connect ke proxy / server (termasuk connect timeout)
+                self.proxy_pool.record_failure(proxy, connect_error=True)
+                self.metrics.inc('request_errors', endpoint=endpoint, proxy=proxy_label)
+                raise
+            except Exception:
+                self.proxy_pool.record_failure(proxy)
+                self.metrics.inc('request_errors', endpoint=endpoint, proxy=proxy_label)
+                raise
+            finally:
+                self.metrics.add_in_flight(-1)
+        
+        latency = time.monotonic() - started
+        self.proxy_pool.record_success(proxy, latency)
+        self.metrics.observe(endpoint, proxy_label, latency)
+        return status_code, text, retry_after
+    
+    async def async_get_current_checkin_status(self, session, semaphore, wallet_address, proxy=None):
+        """Versi async dari get_current_checkin_status"""
+        url = f"{self.base_url}/wallet/check-in/current"
+        params = {'address': wallet_address}
+        
+        try:
+            status_code, text, _ = await self.async_send_request(session, semaphore, 'GET', url, params, proxy)
+            if status_code == 200:
+                return json.loads(text)
+            
+            wallet_logger.warning(f"âŒ Gagal cek status untuk {wallet_address[:8]}...: HTTP {status_code}")
+            return None
+                    
+        except Exception as e:
+            wallet_logger.warning(f"âŒ Error cek status untuk {wallet_address[:8]}...: {str(e) or type(e).__name__}")
+            return None
+    
+    async def async_perform_checkin(self, session, semaphore, wallet_address, proxy=None):
+        """Versi async dari perform_checkin (satu kali percobaan)"""
+        import aiohttp
+        
+        url = f"{self.base_url}/wallet/check-in"
+        params = {'address': wallet_address}
+        
+        try:
+            status_code, text, retry_after = await self.async_send_request(
+                session, semaphore, 'POST', url, params, proxy)
+        except Exception as e:
+            return {
+                'success': False,
+                'error': str(e) or type(e).__name__,
+                'retryable': isinstance(e, aiohttp.ClientError) or self.retry_policy.is_retryable(error=e),
+                'retry_after': None,
+                'wallet': wallet_address
+            }
+        
+        return self.parse_checkin_response(wallet_address, status_code, text, retry_after)
+    
+    async def async_process_single_wallet(self, session, semaphore, wallet_data):
+        """Versi async dari process_single_wallet, menghasilkan result dict yang sama"""
+        import asyncio
+        wallet, index = wallet_data
+        proxy = self.get_proxy_for_wallet(index)
+        
+        ledger_result = self.check_ledger(wallet)
+        if ledger_result:
+            return ledger_result
+        
+        try:
+            if not self.speculative_checkin:
+                wallet_info = await self.async_get_current_checkin_status(session, semaphore, wallet, proxy)
+                
+                if wallet_info is None and proxy:
+                    replacement = self.get_proxy_for_wallet(index)
+                    if replacement is not proxy:
+                        wallet_info = await self.async_get_current_checkin_status(session, semaphore, wallet, replacement)
+                
+                if wallet_info is None:
+                    return {'status': 'failed', 'wallet': wallet, 'message': 'Gagal mendapatkan data'}
+                
+                wallet_logger.info(f"{self.wallet_label(index)} {wallet[:10]}...{wallet[-6:]} ðŸ“Š {self.get_wallet_info(wallet_info)}")
+                
+                if self.remember_status(wallet, wallet_info):
+                    return {'status': 'skipped', 'wallet': wallet, 'message': 'Sudah check-in hari ini'}
+            
+            attempt = 0
+            while True:
+                # Tunggu giliran dari token bucket tanpa menahan slot semaphore
+                wait_time = self.rate_limiter.reserve()
+                if not self.budget.allows_wait(wait_time):
+                    self.rate_limiter.cancel()
+                    return self.dropped_result(wallet)
+                if wait_time > 0:
+                    await asyncio.sleep(wait_time)
+                
+                result = await self.async_perform_checkin(session, semaphore, wallet, proxy)
+                if self.speculative_checkin and not result['success']:
+                    skipped = self.speculative_skip(wallet, result)
+                    if skipped:
+                        return skipped
+                if result['success'] or not result['retryable'] or attempt >= self.retry_count:
+                    break
+                
+                # Retry dijadwalkan di event loop, proxy diambil ulang (bisa sudah dipindah)
+                delay = self.retry_policy.backoff(attempt, result['retry_after'])
+                if not self.budget.allows_wait(delay):
+                    break
+                wallet_logger.warning(f"   ðŸ”„ {wallet[:10]}...{wallet[-6:]} retry {attempt + 1}/{self.retry_count} "
+                      f"dalam {delay:.1f} detik... ({result['error']})")
+                self.metrics.inc('retries')
+                await asyncio.sleep(delay)
+                attempt += 1
+                proxy = self.get_proxy_for_wallet(index)
+            
+            if self.speculative_checkin and not result['success']:
+                wallet_info = await self.async_get_current_checkin_status(session, semaphore, wallet, proxy)
+                skipped = self.confirm_status(wallet, wallet_info)
+                if skipped:
+                    return skipped
+            
+        except Exception as e:
+            logger.error(f"âŒ Exception untuk wallet {wallet[:8]}...: {str(e)}")
+            return {'status': 'failed', 'wallet': wallet, 'message': str(e)}
+        
+        if result['success']:
+            self.record_checkin(wallet, result)
+            wallet_logger.info(f"   âœ… {wallet[:10]}...{wallet[-6:]} check-in berhasil! ðŸŽ {result['points']} points")
+            return {
+                'status': 'success', 
+                'wallet': wallet, 
+                'points': result['points'],
+                'issued_day': result['issued_day']
+            }
+        else:
+            wallet_logger.warning(f"   âŒ {wallet[:10]}...{wallet[-6:]} gagal check-in: {result['error']}")
+            return {'status': 'failed', 'wallet': wallet, 'message': result['error']}
+    
+    def dump_metrics(self):
+        """Tulis snapshot metrics ke METRICS_FILE di akhir run"""
+        if not self.metrics_file:
+            return
+        try:
+            self.metrics.dump(self.metrics_file)
+        except OSError as e:
+            logger.warning(f"âš ï¸ Gagal menulis metrics ke {self.metrics_file}: {e}")
+    
+    def new_results(self):
+        """Counter run baru, sekaligus membuka result sink (RESULT_SINK) dan journal run"""
+        self.close_result_sink()
+        self.result_sink = create_result_sink(self.result_sink_type, self.result_sink_path)
+        self.budget = RunBudget(self.run_budget, self.run_deadline)
+        remaining = self.budget.remaining()
+        if remaining is not None:
+            logger.info(f"â±ï¸ Run budget: {remaining:.1f} detik (deadline {(datetime.now() + timedelta(seconds=remaining)).strftime('%H:%M:%S')})")
+        if self.journal_path:
+            self.journal = RunJournal(self.journal_path, self.journal_fsync, self.journal_fsync_interval)
+            if self.journal.done:
+                logger.info(f"ðŸ”„ Resume run hari ini: {len(self.journal.done)} wallet sudah selesai (journal)")
+        return {
+            'success': 0,
+            'skipped': 0,
+            'failed': 0,
+            'dropped': 0,  # tidak sempat diproses sebelum RUN_BUDGET habis
+            'points': 0,
+            'details': [],  # hanya SUMMARY_DETAIL_LIMIT result pertama, sisanya ke sink
+            'dropped_wallets': []  # juga dibatasi SUMMARY_DETAIL_LIMIT
+        }
+    
+    def close_result_sink(self):
+        if self.result_sink:
+            self.result_sink.close()
+            self.result_sink = None
+        if self.journal:
+            self.journal.close()
+            self.journal = None
+        self.work_queue = None
+    
+    def tally_result(self, results, result):
+        """Tambahkan satu result wallet ke counter run dan tulis ke result sink"""
+        if self.work_queue:
+            if result['status'] == 'failed' and self.work_queue.defer(result['wallet']):
+                wallet_logger.info(f"   ðŸ”„ {result['wallet'][:10]}...{result['wallet'][-6:]} "
+                                   f"ditunda ke second pass ({result.get('message')})")
+                return
+            self.work_queue.done(result['wallet'])
+        
+        if self.result_sink:
+            self.result_sink.write(result)
+        if self.journal:
+            self.journal.record(result)
+        if self.history:
+            self.history.record_wallet(result)
+        
+        # Wallet dropped dilaporkan terpisah (dropped_wallets)
+        if result['status'] != 'dropped' and len(results['details']) < self.summary_detail_limit:
+            results['details'].append(result)
+        
+        self.metrics.inc('wallets', status=result['status'])
+        
+        if result['status'] == 'success':
+            results['success'] += 1
+            results['points'] += result.get('points', 0) or 0
+        elif result['status'] == 'skipped':
+            results['skipped'] += 1
+        elif result['status'] == 'dropped':
+            results['dropped'] += 1
+            if len(results['dropped_wallets']) < self.summary_detail_limit:
+                results['dropped_wallets'].append(result['wallet'])
+        else:
+            results['failed'] += 1
+    
+    def dropped_result(self, wallet):
+        return {'status': 'dropped', 'wallet': wallet, 'message': 'RUN_BUDGET habis'}
+    
+    def drop_remaining(self, results):
+        """Laporkan wallet yang tidak sempat dimulai sebagai dropped (setelah engine berhenti)"""
+        if not self.work_queue or not self.budget.expired():
+            return
+        for wallet, _ in self.work_queue.drain():
+            self.tally_result(results, self.dropped_result(wallet))
+    
     def print_summary(self, results, start_time):
         """Print summary hasil claim"""
         end_time = datetime.now()
         duration = end_time - start_time
         
-        print("\n" + "=" * 60)
-        print("ðŸ“Š CLAIM SUMMARY:")
-        print("=" * 60)
-        print(f"âœ… Berhasil check-in: {results['success']} wallet(s)")
-        print(f"â­ï¸  Sudah check-in: {results['skipped']} wallet(s)")
-        print(f"âŒ Gagal: {results['failed']} wallet(s)")
-        print(f"â±ï¸  Durasi: {duration}")
-        print(f"ðŸ•’ Waktu selesai: {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
-        
-        # Detail points untuk yang berhasil
-        successful_claims = [r for r in results['details'] if r['status'] == 'success']
-        if successful_claims:
-            total_points = sum(r.get('points', 0) for r in successful_claims)
-            print(f"ðŸ’° Total points didapat: {total_points}")
-        
-        print("\nðŸ“ Detail:")
+        if self.shard:
+            # Summary lengkap dicetak coordinator setelah semua shard selesai
+            logger.info(f"âœ… {results['success']} berhasil, â­ï¸ {results['skipped']} skip, "
+                        f"âŒ {results['failed']} gagal, {results['dropped']} di-drop dalam {duration}")
+            return
+        
+        logger.info("\n" + "=" * 60)
+        logger.info("ðŸ“Š CLAIM SUMMARY:")
+        logger.info("=" * 60)
+        logger.info(f"âœ… Berhasil check-in: {results['success']} wallet(s)")
+        logger.info(f"â­ï¸  Sudah check-in: {results['skipped']} wallet(s)")
+        logger.info(f"âŒ Gagal: {results['failed']} wallet(s)")
+        if results.get('dropped'):
+            logger.info(f"âš ï¸ Di-drop (RUN_BUDGET {self.run_budget:g} detik habis): {results['dropped']} wallet(s)")
+        logger.info(f"â±ï¸  Durasi: {duration}")
+        
+        unhealthy = self.proxy_pool.unhealthy()
+        if unhealthy:
+            logger.info(f"âš ï¸ Proxy unhealthy: {', '.join(display_proxy(proxy) for proxy in unhealthy)}")
+        logger.info(f"ðŸ•’ Waktu selesai: {end_time.strftime('%Y-%m-%d %H:%M:%S')}")
+        
+        # Total points untuk yang berhasil
+        if results['success']:
+            logger.info(f"ðŸ’° Total points didapat: {results['points']}")
+        
+        if not results['details']:
+            return
+        
+        logger.info("\nðŸ“ Detail:")
         for result in results['details']:
             status_icon = "âœ…" if result['status'] == 'success' else "â­ï¸" if result['status'] == 'skipped' else "âŒ"
             wallet_short = f"{result['wallet'][:10]}...{result['wallet'][-6:]}"
             if result['status'] == 'success':
-                print(f"  {status_icon} {wallet_short} - {result['points']} points")
+                logger.info(f"  {status_icon} {wallet_short} - {result['points']} points")
             else:
-                print(f"  {status_icon} {wallet_short} - {result.get('message', 'Unknown error')}")
+                logger.info(f"  {status_icon} {wallet_short} - {result.get('message', 'Unknown error')}")
+        
+        dropped_wallets = results.get('dropped_wallets', [])
+        if dropped_wallets:
+            more = results['dropped'] - len(dropped_wallets)
+            logger.info(f"âš ï¸ Wallet di-drop: {', '.join(dropped_wallets)}" + (f" ... dan {more} lainnya" if more > 0 else ""))
+        
+        omitted = results['success'] + results['skipped'] + results['failed'] - len(results['details'])
+        if omitted > 0:
+            sink_path = self.result_sink_path
+            if os.getenv('CLAIM_MODE', '').lower() == 'sharded':
+                sink_path += ".shard*"
+            sink_info = f" (lihat {sink_path})" if self.result_sink_type else ""
+            logger.info(f"  ... dan {omitted} wallet lainnya{sink_info}")
     
-    def update_stats(self, results):
-        """Update statistics setelah setiap run"""
-        self.stats['total_runs'] += 1
-        self.stats['last_run'] = datetime.now()
+    def update_stats(self, results, start_time=None):
+        """Update statistics setelah setiap run (incremental, sekaligus simpan ke history)"""
+        # Total dari history dimuat sebelum run ini dicatat, supaya run ini tidak terhitung dua kali
+        stats = self.stats
+        if self.history:
+            self.history.record_proxies({
+                display_proxy(self.proxy_pool.known[key]): (health['success'] + health['failed'], health['failed'])
+                for key, health in self.proxy_pool.health.items()
+            })
+            # Worker sharded hanya menulis wallet/proxy, baris run dicatat coordinator
+            if not self.shard:
+                started_at = (start_time or datetime.now()).astimezone(timezone.utc)
+                self.history.record_run(started_at, os.getenv('CLAIM_MODE', 'sequential').lower(), results)
         
-        successful_claims = [r for r in results['details'] if r['status'] == 'success']
-        points_this_run = sum(r.get('points', 0) for r in successful_claims)
+        stats['total_runs'] += 1
+        stats['last_run'] = datetime.now(timezone.utc)
         
-        self.stats['total_success'] += results['success']
-        self.stats['total_points'] += points_this_run
+        stats['total_success'] += results['success']
+        stats['total_points'] += results['points']
+        if self.concurrency:
+            stats['concurrency_limit'] = self.concurrency.limit
         
-        # Calculate next run time
+        # Calculate next run time (UTC, sejajar dengan window currentDay API)
         if self.daily_run_time:
-            now = datetime.now()
-            run_hour, run_minute = map(int, self.daily_run_time.split(':'))
-            next_run = now.replace(hour=run_hour, minute=run_minute, second=0, microsecond=0)
-            if next_run <= now:
-                next_run += timedelta(days=1)
-            self.stats['next_run'] = next_run
+            stats['next_run'] = DailyScheduler(self.daily_run_time).next_run()
     
     def show_stats(self):
         """Show cumulative statistics"""
-        print("\n" + "=" * 60)
-        print("ðŸ“ˆ CUMULATIVE STATISTICS:")
-        print("=" * 60)
-        print(f"ðŸ”„ Total Runs: {self.stats['total_runs']}")
-        print(f"âœ… Total Successful Claims: {self.stats['total_success']}")
-        print(f"ðŸ’° Total Points Collected: {self.stats['total_points']}")
+        logger.info("\n" + "=" * 60)
+        logger.info("ðŸ“ˆ CUMULATIVE STATISTICS:")
+        logger.info("=" * 60)
+        logger.info(f"ðŸ”„ Total Runs: {self.stats['total_runs']}")
+        logger.info(f"âœ… Total Successful Claims: {self.stats['total_success']}")
+        logger.info(f"ðŸ’° Total Points Collected: {self.stats['total_points']}")
         if self.stats['last_run']:
-            print(f"ðŸ•’ Last Run: {self.stats['last_run'].strftime('%Y-%m-%d %H:%M:%S')}")
+            logger.info(f"ðŸ•’ Last Run: {self.stats['last_run'].strftime('%Y-%m-%d %H:%M:%S')} UTC")
+        if self.history:
+            self.show_history()
+        if self.stats['concurrency_limit']:
+            logger.info(f"ðŸ§µ Adaptive Concurrency: {self.stats['concurrency_limit']} workers")
         if self.stats['next_run']:
-            print(f"â° Next Run: {self.stats['next_run'].strftime('%Y-%m-%d %H:%M:%S')}")
-        print("=" * 60)
+            logger.info(f"â° Next Run: {self.stats['next_run'].strftime('%Y-%m-%d %H:%M:%S')} UTC")
+        logger.info("=" * 60)
+    
+    def show_history(self):
+        """Wallet dan proxy yang performanya paling rendah dalam HISTORY_REPORT_DAYS terakhir"""
+        days = self.history_days
+        weak_proxies = [row for row in self.history.proxy_failure_rates(days)[:3] if row[2]]
+        for proxy, requests, failures, rate in weak_proxies:
+            logger.info(f"ðŸ”Œ Proxy {proxy}: {rate:.1%} gagal ({failures}/{requests} request, {days} hari)")
+        for wallet, points, failures in self.history.wallet_points(days, limit=3, lowest=True):
+            logger.info(f"ðŸ’° Wallet {wallet[:10]}...{wallet[-6:]}: {points} points, "
+                        f"{failures} gagal ({days} hari)")
     
     def run_daily_scheduler(self):
         """Menjalankan scheduler harian"""
-        print("ðŸ”„ Starting Daily Auto Claim Scheduler...")
-        print(f"â° Daily run time: {self.daily_run_time}")
-        print(f"ðŸ”§ Auto restart: {self.auto_restart}")
-        print("ðŸ’¡ Press Ctrl+C to stop the scheduler")
-        print("-" * 60)
+        logger.info("ðŸ”„ Starting Daily Auto Claim Scheduler...")
+        logger.info(f"â° Daily run time: {self.daily_run_time} UTC")
+        logger.info(f"ðŸ”§ Auto restart: {self.auto_restart}")
+        logger.info("ðŸ’¡ Press Ctrl+C to stop the scheduler")
+        logger.info("-" * 60)
         
         # Show initial stats
         self.show_stats()
         
-        # Schedule daily job
-        schedule.every().day.at(self.daily_run_time).do(self.run_scheduled_claim)
+        scheduler = DailyScheduler(self.daily_run_time)
+        scheduler.install_signal_handlers()
+        
+        try:
+            self.scheduler_loop(scheduler)
+        except KeyboardInterrupt:
+            # Ctrl+C kedua saat run berjalan: tutup journal/result sink supaya bisa di-resume
+            logger.info("\nâš ï¸ Dihentikan paksa, run yang sedang berjalan dibatalkan")
+            self.close_result_sink()
         
+        logger.info("\n\nðŸ‘‹ Shutting down scheduler...")
+        self.show_stats()
+        logger.info("âœ… Scheduler stopped successfully!")
+    
+    def scheduler_loop(self, scheduler):
+        """Loop utama scheduler sampai stop diminta"""
         # Check if we should run immediately on startup
         if os.getenv('RUN_ON_STARTUP', 'true').lower() == 'true':
-            print("\nðŸš€ Running initial claim on startup...")
+            logger.info("\nðŸš€ Running initial claim on startup...")
             self.run_scheduled_claim()
         
-        # Main scheduler loop
-        while True:
+        # Main scheduler loop: tidur sampai deadline berikutnya, bangun lebih awal jika ada signal
+        while not scheduler.stop_requested:
             try:
-                # Check for pending jobs
-                next_run = schedule.next_run()
-                if next_run:
-                    wait_seconds = (next_run - datetime.now()).total_seconds()
-                    if wait_seconds > 0:
-                        print(f"\nâ° Next run scheduled at: {next_run.strftime('%Y-%m-%d %H:%M:%S')}")
-                        print(f"ðŸ’¤ Sleeping for {wait_seconds:.0f} seconds...")
-                        
-                        # Countdown display
-                        while wait_seconds > 0:
-                            hours = int(wait_seconds // 3600)
-                            minutes = int((wait_seconds % 3600) // 60)
-                            seconds = int(wait_seconds % 60)
-                            
-                            if wait_seconds > 3600:
-                                print(f"   ðŸ•’ Next run in: {hours:02d}:{minutes:02d}:{seconds:02d}", end='\r', flush=True)
-                            else:
-                                print(f"   ðŸ•’ Next run in: {minutes:02d}:{seconds:02d}", end='\r', flush=True)
-                            
-                            time.sleep(1)
-                            wait_seconds -= 1
-                        
-                        print("\n" + "=" * 60)
+                next_run = scheduler.next_run()
+                self.stats['next_run'] = next_run
+                wait_seconds = (next_run - datetime.now(timezone.utc)).total_seconds()
+                logger.info(f"\nâ° Next run scheduled at: {next_run.strftime('%Y-%m-%d %H:%M:%S')} UTC")
+                logger.info(f"ðŸ’¤ Sleeping for {wait_seconds:.0f} seconds...")
                 
-                # Run pending jobs
-                schedule.run_pending()
-                time.sleep(1)
+                # Countdown hanya di terminal interaktif
+                on_tick = self.draw_countdown if sys.stdout.isatty() else None
+                reason = scheduler.wait_until(next_run, on_tick)
+                if on_tick:
+                    print()
+                
+                if reason == 'stop':
+                    break
+                if reason == 'run':
+                    logger.info("ðŸš€ On-demand run (SIGUSR1)...")
+                
+                logger.info("=" * 60)
+                self.run_scheduled_claim()
                 
-            except KeyboardInterrupt:
-                print("\n\nðŸ‘‹ Shutting down scheduler...")
-                self.show_stats()
-                print("âœ… Scheduler stopped successfully!")
-                break
             except Exception as e:
-                print(f"\nâš ï¸ Error in scheduler: {str(e)}")
+                logger.error(f"\nâš ï¸ Error in scheduler: {str(e)}")
                 if self.auto_restart:
-                    print("ðŸ”„ Auto-restarting in 60 seconds...")
-                    time.sleep(60)
+                    logger.info("ðŸ”„ Auto-restarting in 60 seconds...")
+                    scheduler.sleep(60)
                 else:
-                    print("âŒ Scheduler stopped due to error!")
+                    logger.error("âŒ Scheduler stopped due to error!")
                     break
     
+    def draw_countdown(self, wait_seconds):
+        """Tampilkan countdown ke run berikutnya (satu baris, ditimpa dengan \\r)"""
+        hours = int(wait_seconds // 3600)
+        minutes = int((wait_seconds % 3600) // 60)
+        seconds = int(wait_seconds % 60)
+        
+        if wait_seconds > 3600:
+            print(f"   ðŸ•’ Next run in: {hours:02d}:{minutes:02d}:{seconds:02d}", end='\r', flush=True)
+        else:
+            print(f"   ðŸ•’ Next run in: {minutes:02d}:{seconds:02d}", end='\r', flush=True)
+    
+    def run_sharded_claim(self):
+        """Menjalankan claim di beberapa worker process (CLAIM_MODE=sharded)"""
+        if not self.has_wallets():
+            logger.error("âŒ Tidak ada wallet yang dikonfigurasi!")
+            return
+        
+        import multiprocessing
+        from concurrent.futures import ProcessPoolExecutor, as_completed
+        
+        logger.info(f"ðŸš€ Memulai Sharded Auto Claim Tea-Fi")
+        logger.info(f"ðŸ“Š Total: {self.describe_wallet_source()}")
+        logger.info(f"ðŸ”Œ Proxies: {len(self.proxies_list)} available")
+        logger.info(f"ðŸ§µ Shards: {self.shard_count} process x engine {self.shard_engine}")
+        logger.info(f"â° Rate limit: {self.describe_rate_limit()} total, dibagi rata ke {self.shard_count} shard")
+        logger.info(f"ðŸ”„ Max retry: {self.retry_count}")
+        logger.info("-" * 60)
+        
+        # Result per wallet ditulis tiap shard ke sink masing-masing (<path>.shardN)
+        results = {'success': 0, 'skipped': 0, 'failed': 0, 'dropped': 0, 'points': 0,
+                   'details': [], 'dropped_wallets': []}
+        start_time = datetime.now()
+        # Deadline RUN_BUDGET dihitung sekali di sini, shard hanya dapat sisa waktu setelah spawn
+        run_deadline = time.time() + self.run_budget if self.run_budget > 0 else None
+        
+        # Spawn (bukan fork) supaya thread logging / session tidak ikut terduplikasi
+        context = multiprocessing.get_context('spawn')
+        with ProcessPoolExecutor(max_workers=self.shard_count, mp_context=context) as executor:
+            futures = {
+                executor.submit(run_shard, shard_index, self.shard_count, self.shard_engine,
+                                self.wallet_filter, run_deadline): shard_index
+                for shard_index in range(self.shard_count)
+            }
+            for future in as_completed(futures):
+                try:
+                    self.merge_shard_results(results, future.result())
+                except Exception as e:
+                    logger.error(f"âŒ Shard {futures[future] + 1} gagal: {str(e)}")
+        
+        # Summary
+        self.print_summary(results, start_time)
+        self.close_result_sink()
+        
+        # Update statistics
+        self.update_stats(results, start_time)
+        self.dump_metrics()
+        return results
+    
+    def merge_shard_results(self, results, shard_results):
+        """Gabungkan counter dan sample detail dari satu shard"""
+        for key in ('success', 'skipped', 'failed', 'dropped', 'points'):
+            results[key] += shard_results.get(key, 0)
+        for key in ('details', 'dropped_wallets'):
+            room = self.summary_detail_limit - len(results[key])
+            if room > 0:
+                results[key].extend(shard_results.get(key, [])[:room])
+        for status in ('success', 'skipped', 'failed', 'dropped'):
+            if shard_results.get(status):
+                self.metrics.inc('wallets', shard_results[status], status=status)
+    
+    def serve_metrics(self):
+        """Jalankan endpoint /metrics (METRICS_PORT) sekali, hanya untuk subcommand yang melakukan claim"""
+        if self.metrics_port and self.metrics.server is None:
+            self.metrics.serve(os.getenv('METRICS_HOST', '127.0.0.1'), self.metrics_port)
+    
+    def fetch_statuses(self, refresh=False):
+        """Status semua wallet (read-only): dari cache jika masih dalam STATUS_CACHE_TTL,
+        sisanya di-fetch paralel. Return list row untuk tabel / JSON"""
+        self.proxy_pool.reset()
+        wallets = list(self.iter_wallets())
+        cache = StatusCache(self.status_cache_path, self.status_cache_ttl) if self.status_cache_path else None
+        cached = cache.get_many(wallet for wallet, _ in wallets) if cache and not refresh else {}
+        
+        missing = [wallet_data for wallet_data in wallets if wallet_data[0] not in cached]
+        fetched = {}
+        if missing:
+            from concurrent.futures import ThreadPoolExecutor
+            
+            def fetch(wallet_data):
+                wallet, index = wallet_data
+                return wallet, self.get_current_checkin_status(wallet, self.get_proxy_for_wallet(index))
+            
+            with ThreadPoolExecutor(max_workers=self.max_workers) as executor:
+                fetched = {wallet: info for wallet, info in executor.map(fetch, missing) if info is not None}
+            if cache and fetched:
+                cache.put_many(fetched)
+        if cache:
+            cache.close()
+        logger.info(f"ðŸ“Š Status {len(wallets)} wallet: {len(cached)} dari cache, "
+                    f"{len(missing)} di-fetch ({len(missing) - len(fetched)} gagal)")
+        
+        rows = []
+        for wallet, index in wallets:
+            wallet_info, age = cached.get(wallet) or (fetched.get(wallet), None)
+            row = {'index': index + 1, 'wallet': wallet, 'cache_age': None if age is None else round(age)}
+            if wallet_info is None:
+                row['error'] = 'Gagal mendapatkan data'
+            else:
+                row.update({
+                    'streak': wallet_info.get('streak'),
+                    'total_points': wallet_info.get('totalPoints'),
+                    'last_check_in': wallet_info.get('lastCheckIn'),
+                    'checked_in_today': self.is_already_checked_in_today(wallet_info)
+                })
+            rows.append(row)
+        return rows
+    
+    def show_status(self, output_format='table', sort='index', refresh=False):
+        """Snapshot status semua (atau sebagian) wallet ke stdout. Return jumlah wallet yang gagal dicek"""
+        sort_keys = {
+            'index': lambda row: row['index'],
+            'wallet': lambda row: row['wallet'].lower(),
+            'streak': lambda row: -(row.get('streak') or 0),
+            'points': lambda row: -(row.get('total_points') or 0),
+            'last': lambda row: row.get('last_check_in') or '',
+        }
+        rows = sorted(self.fetch_statuses(refresh), key=sort_keys[sort])
+        
+        if output_format == 'json':
+            print(json.dumps(rows, indent=2))
+        else:
+            print(f"{'#':>6}  {'wallet':<42}  {'streak':>6}  {'points':>10}  {'last check-in':<24}  today")
+            for row in rows:
+                if 'error' in row:
+                    print(f"{row['index']:>6}  {row['wallet']:<42}  {row['error']}")
+                    continue
+                today = 'yes' if row['checked_in_today'] else 'no'
+                print(f"{row['index']:>6}  {row['wallet']:<42}  {row['streak'] or 0:>6}  "
+                      f"{row['total_points'] or 0:>10}  {row['last_check_in'] or 'never':<24}  {today}")
+        return sum(1 for row in rows if 'error' in row)
+    
+    def run_claim(self):
+        """Jalankan claim sesuai CLAIM_MODE (sequential / parallel / async / sharded)"""
+        self.serve_metrics()
+        mode = os.getenv('CLAIM_MODE', 'sequential').lower()
+        if mode == 'parallel':
+            return self.run_parallel_claim()
+        elif mode == 'async':
+            return self.run_async_claim()
+        elif mode == 'sharded' and self.shard is None:
+            return self.run_sharded_claim()
+        else:
+            return self.run_sequential_claim()
+    
     def run_scheduled_claim(self):
         """Run claim untuk scheduler"""
-        print(f"\nðŸŽ¯ Scheduled Claim Started at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
-        print("=" * 60)
+        logger.info(f"\nðŸŽ¯ Scheduled Claim Started at {datetime.now().strftime('%Y-%m-%d %H:%M:%S')}")
+        logger.info("=" * 60)
         
         try:
-            mode = os.getenv('CLAIM_MODE', 'sequential').lower()
-            if mode == 'parallel':
-                results = self.run_parallel_claim()
-            else:
-                results = self.run_sequential_claim()
+            results = self.run_claim()
             
             # Show updated stats
             self.show_stats()
@@ -514,31 +2565,73 @@ class TeaFiAutoClaim:
             return results
             
         except Exception as e:
-            print(f"âŒ Error during scheduled claim: {str(e)}")
-            import traceback
-            traceback.print_exc()
+            logger.exception(f"âŒ Error during scheduled claim: {str(e)}")
             return None
 
-def main():
-    """Fungsi utama"""
-    auto_claim = TeaFiAutoClaim()
+def run_shard(shard_index, shard_count, engine, wallet_filter=None, run_deadline=None):
+    """Entry point worker process untuk CLAIM_MODE=sharded"""
+    os.environ['CLAIM_MODE'] = engine
+    claimer = TeaFiAutoClaim(shard=(shard_index, shard_count), wallet_filter=wallet_filter,
+                             run_deadline=run_deadline)
+    results = claimer.run_claim() or {}
+    return {key: results.get(key, 0) for key in ('success', 'skipped', 'failed', 'dropped', 'points')} | {
+        'details': results.get('details', []),
+        'dropped_wallets': results.get('dropped_wallets', [])
+    }
+
+def parse_args(argv=None):
+    """Subcommand CLI: claim, status, stats, daemon"""
+    import argparse
     
-    # Check if daily mode is enabled
-    daily_mode = os.getenv('DAILY_MODE', 'false').lower() == 'true'
+    parser = argparse.ArgumentParser(description='Tea-Fi auto check-in')
+    subparsers = parser.add_subparsers(dest='command')
     
-    if daily_mode:
-        # Run in daily scheduler mode
+    claim = subparsers.add_parser('claim', help='satu kali run claim')
+    claim.add_argument('--mode', choices=['sequential', 'parallel', 'async', 'sharded'],
+                       help='override CLAIM_MODE')
+    status = subparsers.add_parser('status', help='snapshot status check-in tanpa claim (exit 1 jika ada yang gagal dicek)')
+    status.add_argument('--format', choices=['table', 'json'], default='table')
+    status.add_argument('--sort', choices=['index', 'wallet', 'streak', 'points', 'last'], default='index')
+    status.add_argument('--refresh', action='store_true', help='abaikan cache STATUS_CACHE_TTL')
+    for subparser in (claim, status):
+        subparser.add_argument('--wallet', '-w', action='append', default=[],
+                               help='hanya wallet ini (bisa diulang atau dipisah koma)')
+    subparsers.add_parser('stats', help='statistik kumulatif dari history, tanpa request ke API')
+    subparsers.add_parser('daemon', help='scheduler harian (sama dengan DAILY_MODE=true)')
+    
+    args = parser.parse_args(argv)
+    args.wallet = [wallet.strip() for value in getattr(args, 'wallet', [])
+                   for wallet in value.split(',') if wallet.strip()]
+    return args
+
+def main(argv=None):
+    """Fungsi utama. Tanpa subcommand: daemon jika DAILY_MODE=true, selain itu claim"""
+    args = parse_args(argv)
+    command = args.command
+    if command is None:
+        command = 'daemon' if os.getenv('DAILY_MODE', 'false').lower() == 'true' else 'claim'
+    if getattr(args, 'mode', None):
+        os.environ['CLAIM_MODE'] = args.mode  # Lewat env supaya ikut ke worker sharded
+    
+    if command == 'status':
+        # stdout khusus tabel / JSON, log ke stderr
+        setup_logging(stream=sys.stderr)
+    
+    auto_claim = TeaFiAutoClaim(wallet_filter=args.wallet)
+    
+    if command == 'daemon':
         auto_claim.run_daily_scheduler()
+    elif command == 'stats':
+        auto_claim.show_stats()
+    elif command == 'status':
+        return 1 if auto_claim.show_status(args.format, args.sort, args.refresh) else 0
     else:
         # Single run mode
-        mode = os.getenv('CLAIM_MODE', 'sequential').lower()
-        if mode == 'parallel':
-            auto_claim.run_parallel_claim()
-        else:
-            auto_claim.run_sequential_claim()
+        auto_claim.run_claim()
         
         # Show stats for single run
         auto_claim.show_stats()
+    return 0
 
 if __name__ == "__main__":
-    main()
+    sys.exit(main())